@@ -4,30 +4,138 @@ Data Analysis Script for Limitless Exchange Market Data
 Analyzes the retrieved market data and provides insights.
 """
 
-import json
 import glob
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, Iterable, Iterator, Any, Optional, Tuple
 
+from json_stream import JSONStreamReader
+from sketches import MarketSketch, save_sketch
+from timeseries import TimeSeriesBuilder, print_time_series
 
-def load_latest_data() -> Dict[str, Any]:
-    """Load the most recent data file."""
+
+def find_latest_data_file() -> Optional[str]:
+    """Return the path of the most recent data file, if any."""
     data_files = glob.glob("limitless_data_*.json")
     if not data_files:
         print("No data files found. Please run the API client first.")
-        return {}
+        return None
     
     latest_file = max(data_files)
     print(f"Loading data from: {latest_file}")
+    return latest_file
+
+
+def read_data_file(path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Read a data file in one pass: market information first, then its events.
+    
+    The market information is decoded immediately (its embedded ``feedEvents``
+    list is skipped); the events of ``feed_events_from_market_info`` are then
+    streamed from the same file position. Data files written by the API client
+    store ``market_info`` before the events.
     
-    with open(latest_file, 'r') as f:
-        return json.load(f)
+    Args:
+        path: Path to a ``limitless_data_*.json`` file
+        
+    Returns:
+        Tuple of the market information and an iterator over the feed events
+    """
+    stream = _iter_data_file(path)
+    market_info = next(stream)
+    return market_info, stream
 
 
-def analyze_market_info(data: Dict[str, Any]) -> None:
-    """Analyze market information."""
-    market_info = data.get('market_info', {})
+def _iter_data_file(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the market information, then each feed event, from one read of the file."""
+    with open(path, 'r') as f:
+        reader = JSONStreamReader(f)
+        market_info = None
+        for key in reader.iter_object():
+            if key == 'market_info':
+                market_info = {}
+                for field in reader.iter_object():
+                    if field != 'feedEvents':
+                        market_info[field] = reader.read_value()
+                yield market_info
+            elif key == 'feed_events_from_market_info':
+                if market_info is None:
+                    market_info = {}
+                    yield market_info
+                yield from reader.iter_array()
+                return
+        if market_info is None:
+            yield {}
+
+
+def load_market_info(path: str) -> Dict[str, Any]:
+    """
+    Load the market information from a data file.
+    
+    The embedded ``feedEvents`` list is skipped rather than decoded; events are
+    read separately with ``iter_feed_events``.
     
+    Args:
+        path: Path to a ``limitless_data_*.json`` file
+        
+    Returns:
+        Dictionary with the market information (without feed events)
+    """
+    market_info, feed_events = read_data_file(path)
+    feed_events.close()
+    return market_info
+
+
+def iter_feed_events(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the feed events of a data file one at a time.
+    
+    Args:
+        path: Path to a ``limitless_data_*.json`` file
+        
+    Yields:
+        Feed event dictionaries from ``feed_events_from_market_info``
+    """
+    with open(path, 'r') as f:
+        reader = JSONStreamReader(f)
+        for key in reader.iter_object():
+            if key == 'feed_events_from_market_info':
+                yield from reader.iter_array()
+                return
+
+
+def iter_archived_events(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the fullest event list a data file holds.
+    
+    The paginated ``feed_events.events`` list is preferred; the
+    ``feed_events_from_market_info`` snapshot is used only when it is missing
+    or empty, as in ``mock_server.load_archive``.
+    
+    Args:
+        path: Path to a ``limitless_data_*.json`` file
+        
+    Yields:
+        Feed event dictionaries
+    """
+    with open(path, 'r') as f:
+        reader = JSONStreamReader(f)
+        found = False
+        for key in reader.iter_object():
+            if key == 'feed_events':
+                for field in reader.iter_object():
+                    if field == 'events':
+                        for event in reader.iter_array():
+                            found = True
+                            yield event
+                if found:
+                    return
+            elif key == 'feed_events_from_market_info':
+                yield from reader.iter_array()
+                return
+
+
+def analyze_market_info(market_info: Dict[str, Any]) -> None:
+    """Analyze market information."""
     print("\n" + "="*60)
     print("MARKET ANALYSIS")
     print("="*60)
@@ -51,44 +159,95 @@ def analyze_market_info(data: Dict[str, Any]) -> None:
     print(f"Tags: {', '.join(market_info.get('tags', []))}")
 
 
-def analyze_feed_events(data: Dict[str, Any]) -> None:
-    """Analyze feed events data."""
-    feed_events = data.get('feed_events_from_market_info', [])
-    
-    print("\n" + "="*60)
-    print("FEED EVENTS ANALYSIS")
-    print("="*60)
-    
-    print(f"Total Events: {len(feed_events)}")
+def scan_feed_events(feed_events: Iterable[Dict[str, Any]],
+                     sketch: Optional[MarketSketch] = None,
+                     series: Optional[TimeSeriesBuilder] = None) -> Dict[str, Any]:
+    """
+    Collect every feed statistic in a single pass over the events.
     
-    if not feed_events:
-        print("No feed events found.")
-        return
+    Args:
+        feed_events: Iterable of feed event dictionaries
+        sketch: Market sketch to fill while scanning; unique traders are
+            estimated from its HyperLogLog instead of a set of addresses
+        series: Builder bucketing the trades for the intraday time series
+        
+    Returns:
+        Statistics consumed by ``analyze_feed_events`` and
+        ``analyze_trading_patterns``
+    """
+    if sketch is None:
+        sketch = MarketSketch("unknown")
     
-    # Analyze event types
-    event_types = {}
-    total_volume = 0
-    unique_users = set()
+    stats = {
+        'total_events': 0,
+        'event_types': {},
+        'total_volume': 0,
+        'recent_events': [],
+        'outcomes': {},
+        'strategies': {},
+        # Events are newest first: the first timestamp seen is the last trade
+        'last_timestamp': None,
+        'first_timestamp': None,
+        'unique_traders': 0,
+    }
     
     for event in feed_events:
+        stats['total_events'] += 1
+        if len(stats['recent_events']) < 5:
+            stats['recent_events'].append(event)
+        
         event_type = event.get('eventType', 'UNKNOWN')
-        event_types[event_type] = event_types.get(event_type, 0) + 1
+        stats['event_types'][event_type] = stats['event_types'].get(event_type, 0) + 1
         
         # Track volume
         if event.get('data', {}).get('tradeAmountUSD'):
-            total_volume += float(event['data']['tradeAmountUSD'])
+            stats['total_volume'] += float(event['data']['tradeAmountUSD'])
+        
+        # Track outcomes and strategies
+        if event_type == 'NEW_TRADE':
+            outcome = event.get('data', {}).get('outcome', 'UNKNOWN')
+            strategy = event.get('data', {}).get('strategy', 'UNKNOWN')
+            stats['outcomes'][outcome] = stats['outcomes'].get(outcome, 0) + 1
+            stats['strategies'][strategy] = stats['strategies'].get(strategy, 0) + 1
+        
+        if event.get('timestamp'):
+            if stats['last_timestamp'] is None:
+                stats['last_timestamp'] = event['timestamp']
+            stats['first_timestamp'] = event['timestamp']
         
         # Track unique users
-        if event.get('user', {}).get('account'):
-            unique_users.add(event['user']['account'])
+        sketch.add_event(event)
+        if series is not None:
+            series.add_event(event)
+    
+    stats['unique_traders'] = sketch.traders.count()
+    return stats
+
+
+def analyze_feed_events(stats: Dict[str, Any]) -> None:
+    """
+    Analyze feed events data.
     
-    print(f"Event Types: {event_types}")
-    print(f"Total Trading Volume: ${total_volume:,.2f}")
-    print(f"Unique Traders: {len(unique_users)}")
+    Args:
+        stats: Result of ``scan_feed_events``
+    """
+    print("\n" + "="*60)
+    print("FEED EVENTS ANALYSIS")
+    print("="*60)
+    
+    print(f"Total Events: {stats['total_events']}")
+    
+    if not stats['total_events']:
+        print("No feed events found.")
+        return
+    
+    print(f"Event Types: {stats['event_types']}")
+    print(f"Total Trading Volume: ${stats['total_volume']:,.2f}")
+    print(f"Unique Traders: {stats['unique_traders']:.0f}")
     
     # Show recent trades
     print(f"\nRecent Trades (last 5):")
-    for i, event in enumerate(feed_events[:5]):
+    for i, event in enumerate(stats['recent_events']):
         if event.get('eventType') == 'NEW_TRADE':
             user = event.get('user', {})
             trade_data = event.get('data', {})
@@ -100,45 +259,36 @@ def analyze_feed_events(data: Dict[str, Any]) -> None:
             print()
 
 
-def analyze_trading_patterns(data: Dict[str, Any]) -> None:
-    """Analyze trading patterns."""
-    feed_events = data.get('feed_events_from_market_info', [])
+def analyze_trading_patterns(stats: Dict[str, Any]) -> None:
+    """
+    Analyze trading patterns.
     
-    if not feed_events:
+    Args:
+        stats: Result of ``scan_feed_events``
+    """
+    if not stats['total_events']:
         return
     
     print("\n" + "="*60)
     print("TRADING PATTERNS ANALYSIS")
     print("="*60)
     
-    # Analyze outcomes
-    outcomes = {}
-    strategies = {}
-    
-    for event in feed_events:
-        if event.get('eventType') == 'NEW_TRADE':
-            outcome = event.get('data', {}).get('outcome', 'UNKNOWN')
-            strategy = event.get('data', {}).get('strategy', 'UNKNOWN')
-            
-            outcomes[outcome] = outcomes.get(outcome, 0) + 1
-            strategies[strategy] = strategies.get(strategy, 0) + 1
-    
-    print(f"Trading Outcomes: {outcomes}")
-    print(f"Trading Strategies: {strategies}")
+    print(f"Trading Outcomes: {stats['outcomes']}")
+    print(f"Trading Strategies: {stats['strategies']}")
     
     # Time analysis
-    if feed_events:
-        timestamps = [event.get('timestamp') for event in feed_events if event.get('timestamp')]
-        if timestamps:
-            try:
-                start_time = datetime.fromisoformat(timestamps[-1].replace('Z', '+00:00'))
-                end_time = datetime.fromisoformat(timestamps[0].replace('Z', '+00:00'))
-                duration = end_time - start_time
-                print(f"Trading Period: {duration}")
-                print(f"First Trade: {timestamps[-1]}")
-                print(f"Last Trade: {timestamps[0]}")
-            except Exception as e:
-                print(f"Could not parse timestamps: {e}")
+    first_timestamp = stats['first_timestamp']
+    last_timestamp = stats['last_timestamp']
+    if first_timestamp:
+        try:
+            start_time = datetime.fromisoformat(first_timestamp.replace('Z', '+00:00'))
+            end_time = datetime.fromisoformat(last_timestamp.replace('Z', '+00:00'))
+            duration = end_time - start_time
+            print(f"Trading Period: {duration}")
+            print(f"First Trade: {first_timestamp}")
+            print(f"Last Trade: {last_timestamp}")
+        except Exception as e:
+            print(f"Could not parse timestamps: {e}")
 
 
 def main():
@@ -146,15 +296,22 @@ def main():
     print("Limitless Exchange Data Analysis")
     print("="*60)
     
-    # Load data
-    data = load_latest_data()
-    if not data:
+    # Locate data; the file is read once and its events streamed through every analysis
+    data_file = find_latest_data_file()
+    if not data_file:
         return
     
     # Run analyses
-    analyze_market_info(data)
-    analyze_feed_events(data)
-    analyze_trading_patterns(data)
+    market_info, feed_events = read_data_file(data_file)
+    sketch = MarketSketch(market_info.get('slug', data_file), market_info.get('id'))
+    series = TimeSeriesBuilder("1m", sketch.market_slug)
+    analyze_market_info(market_info)
+    stats = scan_feed_events(feed_events, sketch, series)
+    analyze_feed_events(stats)
+    analyze_trading_patterns(stats)
+    print_time_series(series.build(), window=5, label=sketch.market_slug)
+    
+    print(f"\nMarket sketch saved to: {save_sketch(sketch)}")
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETE")
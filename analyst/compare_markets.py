@@ -1,164 +1,347 @@
 #!/usr/bin/env python3
 """
 Market Comparison Script
-Compares the BTC and DOGE markets side by side.
+Compares any number of markets side by side.
 """
 
 from limitless_api_client import LimitlessExchangeAPI
+from sketches import MarketSketch, merge_sketches, save_sketch
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import argparse
 import json
+import re
+import threading
 from datetime import datetime
 
 
-def compare_markets():
-    """Compare BTC and DOGE markets."""
-    print("Limitless Exchange - Market Comparison")
-    print("=" * 80)
-    
-    # Initialize API client
-    api_client = LimitlessExchangeAPI()
-    
-    # Market slugs
-    btc_market_slug = "dollarbtc-above-dollar11699601-on-aug-15-2100-utc-1755288010549"
-    doge_market_slug = "dollardoge-above-dollar022223-on-aug-15-2000-utc-1755284410619"
-    
-    # Fetch market data
-    print("Fetching market data...")
-    btc_market = api_client.get_market_info(btc_market_slug)
-    doge_market = api_client.get_market_info(doge_market_slug)
-    
-    if "error" in btc_market or "error" in doge_market:
-        print("Error fetching market data")
-        return
-    
-    # Display comparison table
-    print("\n" + "=" * 80)
+DEFAULT_MARKET_SLUGS = [
+    "dollarbtc-above-dollar11699601-on-aug-15-2100-utc-1755288010549",
+    "dollardoge-above-dollar022223-on-aug-15-2000-utc-1755284410619",
+]
+
+_THRESHOLD_PATTERN = re.compile(r'above \$([0-9][0-9,]*(?:\.[0-9]+)?)')
+_SYMBOL_PATTERN = re.compile(r'\$([A-Z][A-Z0-9]*)')
+
+_local = threading.local()
+
+
+class Metric:
+    """
+    A single row of the comparison table.
+
+    Metrics are declarative: ``start`` builds per-market state, ``update`` folds
+    one feed event into it and ``finish`` turns the state into the reported
+    value. All metrics for a market share one sweep over its events; ``finish``
+    also sees the values of metrics declared earlier, so derived metrics can
+    build on them.
+    """
+
+    def __init__(self, key: str, label: str,
+                 finish: Callable[[Any, Dict[str, Any], Dict[str, Any]], Any],
+                 start: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 update: Optional[Callable[[Any, Dict[str, Any]], Any]] = None,
+                 fmt: Callable[[Any], str] = str):
+        self.key = key
+        self.label = label
+        self.start = start
+        self.update = update
+        self.finish = finish
+        self.fmt = fmt
+
+
+def _field(path: str, default: Any = None) -> Callable[[Any, Dict[str, Any], Dict[str, Any]], Any]:
+    """Finish function reading a (dotted) field of the market response."""
+    def finish(state, market, values):
+        value = market
+        for part in path.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        return default if value is None else value
+    return finish
+
+
+def _count_outcomes(state: Dict[str, int], event: Dict[str, Any]) -> Dict[str, int]:
+    outcome = event.get('data', {}).get('outcome', 'UNKNOWN')
+    state[outcome] = state.get(outcome, 0) + 1
+    return state
+
+
+def _track_timestamps(state: List[Optional[str]], event: Dict[str, Any]) -> List[Optional[str]]:
+    # Events are newest first: keep the first timestamp seen and the latest one
+    timestamp = event.get('timestamp')
+    if timestamp:
+        if state[1] is None:
+            state[1] = timestamp
+        state[0] = timestamp
+    return state
+
+
+def _trading_period(state: List[Optional[str]], market, values) -> str:
+    first, last = state
+    if not first:
+        return 'N/A'
+    try:
+        start = datetime.fromisoformat(first.replace('Z', '+00:00'))
+        end = datetime.fromisoformat(last.replace('Z', '+00:00'))
+        return str(end - start).split('.')[0]
+    except ValueError:
+        return 'N/A'
+
+
+def _threshold(state, market, values) -> Optional[str]:
+    match = _THRESHOLD_PATTERN.search(market.get('title', ''))
+    return match.group(1).replace(',', '') if match else None
+
+
+def _price_result(state, market, values) -> Optional[str]:
+    threshold = values.get('threshold')
+    actual = values.get('resolve_price')
+    if threshold is None or not isinstance(actual, (int, float)):
+        return None
+    return "YES" if actual > float(threshold) else "NO"
+
+
+def _sentiment(state, market, values) -> str:
+    if not values.get('total_trades'):
+        return "N/A"
+    result = values.get('price_result')
+    yes_ratio = values.get('yes_ratio')
+    if result is None or yes_ratio == 0.5:
+        return "mixed"
+    majority = "YES" if yes_ratio > 0.5 else "NO"
+    return "correct" if majority == result else "incorrect"
+
+
+def _na(value: Any) -> str:
+    return 'N/A' if value is None else str(value)
+
+
+METRICS: List[Metric] = [
+    Metric('title', 'Market Title', _field('title', 'N/A'), fmt=lambda v: str(v)[:23]),
+    Metric('id', 'Market ID', _field('id', 'N/A')),
+    Metric('status', 'Status', _field('status', 'N/A')),
+    Metric('winning_outcome', 'Winning Outcome', _field('winningOutcomeIndex', 'N/A')),
+    Metric('resolve_price', 'Resolve Price', _field('metadata.resolvePrice'), fmt=lambda v: f"${_na(v)}"),
+    Metric('volume', 'Volume (USDC)', _field('volumeFormatted', 'N/A')),
+    Metric('liquidity', 'Liquidity (USDC)', _field('liquidityFormatted', 'N/A')),
+    Metric('open_interest', 'Open Interest (USDC)', _field('openInterestFormatted', 'N/A')),
+    Metric('created', 'Created', _field('createdAt', 'N/A'), fmt=lambda v: str(v)[:19]),
+    Metric('expired', 'Expired', _field('expired', 'N/A')),
+    Metric('total_trades', 'Total Trades', lambda state, market, values: state,
+           start=lambda market: 0, update=lambda state, event: state + 1),
+    Metric('unique_traders', 'Unique Traders', lambda state, market, values: round(state.traders.count()),
+           start=lambda market: MarketSketch(market.get('slug', 'unknown'), market.get('id')),
+           update=lambda state, event: state.add_event(event) or state),
+    Metric('trade_volume', 'Trade Volume (USDC)', lambda state, market, values: state,
+           start=lambda market: 0.0,
+           update=lambda state, event: state + float(event.get('data', {}).get('tradeAmountUSD', 0)),
+           fmt=lambda v: f"${v:.2f}"),
+    Metric('outcomes', 'Outcomes', lambda state, market, values: state,
+           start=lambda market: {}, update=_count_outcomes),
+    Metric('yes_trades', 'YES Trades', lambda state, market, values: values['outcomes'].get('YES', 0)),
+    Metric('no_trades', 'NO Trades', lambda state, market, values: values['outcomes'].get('NO', 0)),
+    Metric('trading_period', 'Trading Period', _trading_period,
+           start=lambda market: [None, None], update=_track_timestamps),
+    Metric('threshold', 'Threshold', _threshold, fmt=lambda v: f"${_na(v)}"),
+    Metric('price_result', 'Price Result', _price_result, fmt=_na),
+    Metric('yes_ratio', 'Bullish (YES) Share',
+           lambda state, market, values: (values['yes_trades'] / values['total_trades']
+                                          if values['total_trades'] else 0),
+           fmt=lambda v: f"{v*100:.0f}%"),
+    Metric('sentiment', 'Sentiment', _sentiment),
+]
+
+# Rows shown in the table; the remaining metrics feed insights and JSON output
+TABLE_METRICS = [
+    'title', 'id', 'status', 'winning_outcome', 'resolve_price', 'volume', 'liquidity',
+    'open_interest', 'created', 'expired', 'total_trades', 'unique_traders', 'trade_volume',
+    'yes_trades', 'no_trades', 'trading_period',
+]
+
+
+def fetch_market(slug: str) -> Dict[str, Any]:
+    """Fetch a market using a client private to the calling thread."""
+    if not hasattr(_local, 'api_client'):
+        _local.api_client = LimitlessExchangeAPI()
+    return _local.api_client.get_market_info(slug)
+
+
+def fetch_markets(slugs: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch several markets concurrently.
+
+    Args:
+        slugs: Market slug identifiers
+        max_workers: Maximum concurrent requests (default: one per market)
+
+    Returns:
+        Market responses in the same order as ``slugs``
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or len(slugs)) as executor:
+        return list(executor.map(fetch_market, slugs))
+
+
+def compute_metrics(market: Dict[str, Any], metrics: List[Metric] = METRICS) -> Dict[str, Any]:
+    """
+    Compute every metric for a market in a single sweep over its feed events.
+
+    Args:
+        market: Market response including ``feedEvents``
+        metrics: Metrics to compute, in dependency order
+
+    Returns:
+        Dictionary mapping metric key to value; per-metric state is kept under
+        ``_state`` for callers that need it (e.g. the trader sketch)
+    """
+    states = [metric.start(market) if metric.start else None for metric in metrics]
+    updaters = [(i, metric.update) for i, metric in enumerate(metrics) if metric.update]
+
+    for event in market.get('feedEvents', []):
+        for i, update in updaters:
+            states[i] = update(states[i], event)
+
+    values = {}
+    for metric, state in zip(metrics, states):
+        values[metric.key] = metric.finish(state, market, values)
+    values['_state'] = {metric.key: state for metric, state in zip(metrics, states)}
+    return values
+
+
+def market_label(values: Dict[str, Any], seen: Dict[str, int]) -> str:
+    """Short column label such as ``BTC Market``; repeated symbols get the market id."""
+    match = _SYMBOL_PATTERN.search(str(values.get('title', '')))
+    symbol = match.group(1) if match else str(values.get('id', 'Market'))
+    seen[symbol] = seen.get(symbol, 0) + 1
+    if seen[symbol] > 1:
+        return f"{symbol} #{values.get('id')}"
+    return f"{symbol} Market"
+
+
+def print_table(labels: List[str], results: List[Dict[str, Any]]) -> None:
+    """Print the comparison table, one column per market."""
+    metrics = {metric.key: metric for metric in METRICS}
+    width = 25 + 26 * len(labels)
+
+    print("\n" + "=" * width)
     print("MARKET COMPARISON")
-    print("=" * 80)
-    
-    print(f"{'Metric':<25} {'BTC Market':<25} {'DOGE Market':<25}")
-    print("-" * 80)
-    
-    print(f"{'Market Title':<25} {btc_market.get('title', 'N/A')[:23]:<25} {doge_market.get('title', 'N/A')[:23]:<25}")
-    print(f"{'Market ID':<25} {btc_market.get('id', 'N/A'):<25} {doge_market.get('id', 'N/A'):<25}")
-    print(f"{'Status':<25} {btc_market.get('status', 'N/A'):<25} {doge_market.get('status', 'N/A'):<25}")
-    print(f"{'Winning Outcome':<25} {btc_market.get('winningOutcomeIndex', 'N/A'):<25} {doge_market.get('winningOutcomeIndex', 'N/A'):<25}")
-    
-    btc_resolve = btc_market.get('metadata', {}).get('resolvePrice', 'N/A')
-    doge_resolve = doge_market.get('metadata', {}).get('resolvePrice', 'N/A')
-    print(f"{'Resolve Price':<25} ${btc_resolve:<24} ${doge_resolve:<24}")
-    
-    print(f"{'Volume (USDC)':<25} {btc_market.get('volumeFormatted', 'N/A'):<25} {doge_market.get('volumeFormatted', 'N/A'):<25}")
-    print(f"{'Liquidity (USDC)':<25} {btc_market.get('liquidityFormatted', 'N/A'):<25} {doge_market.get('liquidityFormatted', 'N/A'):<25}")
-    print(f"{'Open Interest (USDC)':<25} {btc_market.get('openInterestFormatted', 'N/A'):<25} {doge_market.get('openInterestFormatted', 'N/A'):<25}")
-    
-    print(f"{'Created':<25} {btc_market.get('createdAt', 'N/A')[:19]:<25} {doge_market.get('createdAt', 'N/A')[:19]:<25}")
-    print(f"{'Expired':<25} {btc_market.get('expired', 'N/A'):<25} {doge_market.get('expired', 'N/A'):<25}")
-    
-    # Trading activity comparison
-    btc_events = btc_market.get('feedEvents', [])
-    doge_events = doge_market.get('feedEvents', [])
-    
-    print(f"{'Total Trades':<25} {len(btc_events):<25} {len(doge_events):<25}")
-    
-    # Calculate unique traders
-    btc_traders = len(set(event.get('user', {}).get('account') for event in btc_events))
-    doge_traders = len(set(event.get('user', {}).get('account') for event in doge_events))
-    print(f"{'Unique Traders':<25} {btc_traders:<25} {doge_traders:<25}")
-    
-    # Calculate total volume from trades
-    btc_volume = sum(float(event.get('data', {}).get('tradeAmountUSD', 0)) for event in btc_events)
-    doge_volume = sum(float(event.get('data', {}).get('tradeAmountUSD', 0)) for event in doge_events)
-    print(f"{'Trade Volume (USDC)':<25} ${btc_volume:<24.2f} ${doge_volume:<24.2f}")
-    
-    # Trading outcomes analysis
-    btc_outcomes = {}
-    doge_outcomes = {}
-    
-    for event in btc_events:
-        outcome = event.get('data', {}).get('outcome', 'UNKNOWN')
-        btc_outcomes[outcome] = btc_outcomes.get(outcome, 0) + 1
-    
-    for event in doge_events:
-        outcome = event.get('data', {}).get('outcome', 'UNKNOWN')
-        doge_outcomes[outcome] = doge_outcomes.get(outcome, 0) + 1
-    
-    print(f"{'YES Trades':<25} {btc_outcomes.get('YES', 0):<25} {doge_outcomes.get('YES', 0):<25}")
-    print(f"{'NO Trades':<25} {btc_outcomes.get('NO', 0):<25} {doge_outcomes.get('NO', 0):<25}")
-    
-    # Trading period analysis
-    if btc_events:
-        btc_timestamps = [event.get('timestamp') for event in btc_events if event.get('timestamp')]
-        if btc_timestamps:
-            try:
-                btc_start = datetime.fromisoformat(btc_timestamps[-1].replace('Z', '+00:00'))
-                btc_end = datetime.fromisoformat(btc_timestamps[0].replace('Z', '+00:00'))
-                btc_duration = btc_end - btc_start
-                btc_duration_str = str(btc_duration).split('.')[0]
-            except:
-                btc_duration_str = 'N/A'
-        else:
-            btc_duration_str = 'N/A'
-    else:
-        btc_duration_str = 'N/A'
-    
-    if doge_events:
-        doge_timestamps = [event.get('timestamp') for event in doge_events if event.get('timestamp')]
-        if doge_timestamps:
-            try:
-                doge_start = datetime.fromisoformat(doge_timestamps[-1].replace('Z', '+00:00'))
-                doge_end = datetime.fromisoformat(doge_timestamps[0].replace('Z', '+00:00'))
-                doge_duration = doge_end - doge_start
-                doge_duration_str = str(doge_duration).split('.')[0]
-            except:
-                doge_duration_str = 'N/A'
-        else:
-            doge_duration_str = 'N/A'
-    else:
-        doge_duration_str = 'N/A'
-    
-    print(f"{'Trading Period':<25} {btc_duration_str:<25} {doge_duration_str:<25}")
-    
-    print("\n" + "=" * 80)
+    print("=" * width)
+
+    print(f"{'Metric':<25} " + " ".join(f"{label[:25]:<25}" for label in labels))
+    print("-" * width)
+    for key in TABLE_METRICS:
+        metric = metrics[key]
+        cells = " ".join(f"{metric.fmt(values[key]):<25}" for values in results)
+        print(f"{metric.label:<25} {cells}")
+
+
+def print_insights(labels: List[str], results: List[Dict[str, Any]]) -> None:
+    """Print per-market outcome, volume and sentiment insights."""
+    width = 25 + 26 * len(labels)
+    print("\n" + "=" * width)
     print("KEY INSIGHTS")
-    print("=" * 80)
-    
+    print("=" * width)
+
     # Market outcome analysis
-    btc_threshold = 116996.01
-    btc_actual = btc_market.get('metadata', {}).get('resolvePrice', 0)
-    btc_result = "YES" if btc_actual > btc_threshold else "NO"
-    
-    doge_threshold = 0.22223
-    doge_actual = doge_market.get('metadata', {}).get('resolvePrice', 0)
-    doge_result = "YES" if doge_actual > doge_threshold else "NO"
-    
-    print(f"• BTC Market: Price was ${btc_actual:,.2f} vs ${btc_threshold:,.2f} threshold → {btc_result}")
-    print(f"• DOGE Market: Price was ${doge_actual:.5f} vs ${doge_threshold:.5f} threshold → {doge_result}")
-    
+    for label, values in zip(labels, results):
+        threshold, actual = values['threshold'], values['resolve_price']
+        if threshold is None or not isinstance(actual, (int, float)):
+            continue
+        decimals = len(threshold.split('.')[1]) if '.' in threshold else 0
+        print(f"• {label}: Price was ${actual:,.{decimals}f} vs ${float(threshold):,.{decimals}f} "
+              f"threshold → {values['price_result']}")
+
     # Volume comparison
-    btc_total_volume = float(btc_market.get('volumeFormatted', 0))
-    doge_total_volume = float(doge_market.get('volumeFormatted', 0))
-    
-    if btc_total_volume > doge_total_volume:
-        print(f"• BTC market had {btc_total_volume/doge_total_volume:.1f}x more volume than DOGE market")
-    else:
-        print(f"• DOGE market had {doge_total_volume/btc_total_volume:.1f}x more volume than BTC market")
-    
+    volumes = [(float(values['volume']) if values['volume'] != 'N/A' else 0.0, label)
+               for label, values in zip(labels, results)]
+    volumes.sort(reverse=True)
+    if len(volumes) >= 2 and volumes[-1][0] > 0:
+        top_volume, top_label = volumes[0]
+        low_volume, low_label = volumes[-1]
+        print(f"• {top_label} had {top_volume/low_volume:.1f}x more volume than {low_label}")
+
     # Trading pattern analysis
-    btc_yes_ratio = btc_outcomes.get('YES', 0) / len(btc_events) if btc_events else 0
-    doge_yes_ratio = doge_outcomes.get('YES', 0) / len(doge_events) if doge_events else 0
-    
-    print(f"• BTC traders were {btc_yes_ratio*100:.0f}% bullish (YES positions)")
-    print(f"• DOGE traders were {doge_yes_ratio*100:.0f}% bullish (YES positions)")
-    
+    for label, values in zip(labels, results):
+        print(f"• {label} traders were {values['yes_ratio']*100:.0f}% bullish (YES positions)")
+
     # Accuracy analysis
-    btc_accuracy = "correct" if btc_result == "YES" and btc_yes_ratio > 0.5 else "incorrect" if btc_result == "NO" and btc_yes_ratio < 0.5 else "mixed"
-    doge_accuracy = "correct" if doge_result == "YES" and doge_yes_ratio > 0.5 else "incorrect" if doge_result == "NO" and doge_yes_ratio < 0.5 else "mixed"
-    
-    print(f"• BTC market sentiment was {btc_accuracy} (majority was {'bullish' if btc_yes_ratio > 0.5 else 'bearish'})")
-    print(f"• DOGE market sentiment was {doge_accuracy} (majority was {'bullish' if doge_yes_ratio > 0.5 else 'bearish'})")
-    
-    print("\n" + "=" * 80)
+    for label, values in zip(labels, results):
+        if not values['total_trades']:
+            majority = 'N/A'
+        elif values['yes_ratio'] == 0.5:
+            majority = 'even'
+        else:
+            majority = 'bullish' if values['yes_ratio'] > 0.5 else 'bearish'
+        print(f"• {label} sentiment was {values['sentiment']} (majority was {majority})")
+
+    if len(results) > 1:
+        combined = merge_sketches(values['_state']['unique_traders'] for values in results)
+        print(f"• ~{combined.traders.count():.0f} distinct traders across all {len(results)} markets")
+
+
+def to_json(slugs: List[str], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Machine-readable form of the comparison."""
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "markets": [
+            dict({"slug": slug}, **{k: v for k, v in values.items() if not k.startswith('_')})
+            for slug, values in zip(slugs, results)
+        ],
+    }
+
+
+def compare_markets(slugs: List[str] = DEFAULT_MARKET_SLUGS, max_workers: Optional[int] = None,
+                    json_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compare any number of markets.
+
+    Args:
+        slugs: Market slug identifiers to compare
+        max_workers: Maximum concurrent fetches (default: one per market)
+        json_path: Optional path to write the machine-readable comparison to
+
+    Returns:
+        The machine-readable comparison (empty if fetching failed)
+    """
+    print("Limitless Exchange - Market Comparison")
+    print("=" * 80)
+
+    # Fetch market data
+    print("Fetching market data...")
+    markets = fetch_markets(slugs, max_workers)
+
+    failed = [slug for slug, market in zip(slugs, markets) if "error" in market]
+    if failed:
+        print(f"Error fetching market data: {', '.join(failed)}")
+        return {}
+
+    results = [compute_metrics(market) for market in markets]
+    for values in results:
+        save_sketch(values['_state']['unique_traders'])
+
+    seen = {}
+    labels = [market_label(values, seen) for values in results]
+    print_table(labels, results)
+    print_insights(labels, results)
+    print("\n" + "=" * (25 + 26 * len(labels)))
+
+    report = to_json(slugs, results)
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Comparison saved to: {json_path}")
+    return report
+
+
+def main():
+    """Parse command line arguments and run the comparison."""
+    parser = argparse.ArgumentParser(description="Compare Limitless Exchange markets side by side.")
+    parser.add_argument("slugs", nargs="*", default=DEFAULT_MARKET_SLUGS, help="Market slugs to compare")
+    parser.add_argument("--workers", type=int, default=None, help="Maximum concurrent fetches")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write the comparison as JSON to this path")
+    args = parser.parse_args()
+
+    compare_markets(args.slugs, args.workers, args.json_path)
 
 
 if __name__ == "__main__":
-    compare_markets()
+    main()
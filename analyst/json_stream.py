@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON Reader
+Walks large JSON documents without loading the whole object tree into memory.
+"""
+
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+
+_WHITESPACE = re.compile(r'\s*')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_SCALAR_END = re.compile(r'[\s,\]}]')
+
+
+class JSONStreamReader:
+    """Pull-style reader over a JSON text stream.
+
+    Objects and arrays are walked with ``iter_object`` / ``iter_array`` so only
+    the value currently being decoded is held in memory. Values that are not
+    needed can be passed over with ``skip_value`` without ever being built.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = 64 * 1024):
+        """
+        Initialize the reader.
+
+        Args:
+            fp: Text file object positioned at the start of a JSON value
+            chunk_size: Number of characters to read from the file at a time
+        """
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        self._dropped = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, discarding text before the current position."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._dropped += self._pos
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _refill(self, index: int) -> int:
+        """Read more input and return ``index`` rebased onto the new buffer."""
+        shift = self._pos
+        if not self._fill():
+            raise ValueError(f"Unexpected end of JSON input at offset {self._offset()}")
+        return index - shift
+
+    def _offset(self) -> int:
+        """Absolute character offset of the current position."""
+        return self._dropped + self._pos
+
+    def _skip_ws(self) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill():
+                return
+
+    def _peek(self) -> str:
+        self._skip_ws()
+        return self._buf[self._pos:self._pos + 1]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._offset()}")
+        self._pos += 1
+
+    def _string_end(self, index: int) -> int:
+        while True:
+            match = _STRING.match(self._buf, index)
+            if match:
+                return match.end()
+            index = self._refill(index)
+
+    def _scan(self, keep: bool) -> int:
+        """Return the buffer index just past the value at the current position.
+
+        With ``keep`` False the consumed prefix is released as the scan goes,
+        so skipping a large value never holds all of it in memory.
+        """
+        first = self._peek()
+        index = self._pos
+        if not first:
+            raise ValueError(f"Unexpected end of JSON input at offset {self._offset()}")
+        if first == '"':
+            return self._string_end(index)
+
+        if first in '[{':
+            depth = 0
+            while True:
+                match = _STRUCTURE.search(self._buf, index)
+                if match is None:
+                    if not keep:
+                        self._pos = len(self._buf)
+                    index = self._refill(len(self._buf))
+                    continue
+                char = match.group()
+                if char == '"':
+                    if not keep:
+                        self._pos = match.start()
+                    index = self._string_end(match.start())
+                elif char in '[{':
+                    depth += 1
+                    index = match.end()
+                else:
+                    depth -= 1
+                    index = match.end()
+                    if depth == 0:
+                        return index
+
+        while True:
+            match = _SCALAR_END.search(self._buf, index)
+            if match:
+                return match.start()
+            shift = self._pos
+            if not self._fill():
+                return len(self._buf)
+            index -= shift
+
+    def read_value(self) -> Any:
+        """Decode and return the next complete value."""
+        end = self._scan(keep=True)
+        text = self._buf[self._pos:end]
+        self._pos = end
+        return json.loads(text)
+
+    def skip_value(self) -> None:
+        """Consume the next value without decoding it."""
+        self._pos = self._scan(keep=False)
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position.
+
+        After each key the caller should consume its value with ``read_value``,
+        ``skip_value``, ``iter_object`` or ``iter_array``. Values left untouched
+        are skipped automatically.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            self._skip_ws()
+            end = self._string_end(self._pos)
+            key = json.loads(self._buf[self._pos:end])
+            self._pos = end
+            self._expect(':')
+
+            mark = self._offset()
+            yield key
+            if self._offset() == mark:
+                self.skip_value()
+
+            if self._peek() == '}':
+                self._pos += 1
+                return
+            self._expect(',')
+
+    def iter_array(self) -> Iterator[Any]:
+        """Decode and yield the items of the array at the current position one at a time."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self._peek() == ']':
+                self._pos += 1
+                return
+            self._expect(',')
@@ -11,17 +11,27 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 
+def _error_result(e: requests.exceptions.RequestException) -> Dict[str, Any]:
+    """Error result for a failed request, with the HTTP status code when there is one."""
+    result = {"error": str(e)}
+    if getattr(e, 'response', None) is not None:
+        result["status_code"] = e.response.status_code
+    return result
+
+
 class LimitlessExchangeAPI:
     """Client for interacting with the Limitless Exchange API."""
     
-    def __init__(self, base_url: str = "https://api.limitless.exchange"):
+    def __init__(self, base_url: str = "https://api.limitless.exchange", verbose: bool = True):
         """
         Initialize the API client.
         
         Args:
             base_url: Base URL for the Limitless Exchange API
+            verbose: Print progress and error details for each request
         """
         self.base_url = base_url.rstrip('/')
+        self.verbose = verbose
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'LimitlessExchangeAPIClient/1.0',
@@ -47,8 +57,9 @@ class LimitlessExchangeAPI:
         }
         
         try:
-            print(f"Fetching feed events from: {endpoint}")
-            print(f"Parameters: {params}")
+            if self.verbose:
+                print(f"Fetching feed events from: {endpoint}")
+                print(f"Parameters: {params}")
             
             response = self.session.get(endpoint, params=params)
             response.raise_for_status()
@@ -56,11 +67,12 @@ class LimitlessExchangeAPI:
             return response.json()
             
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching data: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response status: {e.response.status_code}")
-                print(f"Response content: {e.response.text}")
-            return {"error": str(e)}
+            if self.verbose:
+                print(f"Error fetching data: {e}")
+                if hasattr(e, 'response') and e.response is not None:
+                    print(f"Response status: {e.response.status_code}")
+                    print(f"Response content: {e.response.text}")
+            return _error_result(e)
     
     def get_market_info(self, market_slug: str) -> Dict[str, Any]:
         """
@@ -75,7 +87,8 @@ class LimitlessExchangeAPI:
         endpoint = f"{self.base_url}/markets/{market_slug}"
         
         try:
-            print(f"Fetching market info from: {endpoint}")
+            if self.verbose:
+                print(f"Fetching market info from: {endpoint}")
             
             response = self.session.get(endpoint)
             response.raise_for_status()
@@ -83,11 +96,12 @@ class LimitlessExchangeAPI:
             return response.json()
             
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching market info: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response status: {e.response.status_code}")
-                print(f"Response content: {e.response.text}")
-            return {"error": str(e)}
+            if self.verbose:
+                print(f"Error fetching market info: {e}")
+                if hasattr(e, 'response') and e.response is not None:
+                    print(f"Response status: {e.response.status_code}")
+                    print(f"Response content: {e.response.text}")
+            return _error_result(e)
 
 
 def main():
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness
+Benchmarks the Limitless API client against the local mock server and
+reports throughput and latency percentiles for sync and concurrent use.
+"""
+
+from limitless_api_client import LimitlessExchangeAPI
+from mock_server import MockBehavior, load_archive, start_mock_server
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import math
+import threading
+import time
+
+
+_local = threading.local()
+
+
+def _client(base_url: str) -> LimitlessExchangeAPI:
+    """Per-thread client; requests sessions are not shared across threads."""
+    if getattr(_local, 'base_url', None) != base_url:
+        _local.client = LimitlessExchangeAPI(base_url, verbose=False)
+        _local.base_url = base_url
+    return _local.client
+
+
+def _call(base_url: str, request: Tuple[str, str]) -> Tuple[float, str]:
+    """Issue one request and return (latency in seconds, outcome)."""
+    endpoint, slug = request
+    client = _client(base_url)
+    started = time.perf_counter()
+    if endpoint == 'feed':
+        result = client.get_market_feed_events(slug, limit=50)
+    else:
+        result = client.get_market_info(slug)
+    latency = time.perf_counter() - started
+
+    if "error" not in result:
+        return latency, 'ok'
+    if result.get('status_code') == 429:
+        return latency, 'rate_limited'
+    return latency, 'error'
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # Round first so float noise (0.7 * 10 == 7.000000000000001) does not bump the rank
+    rank = math.ceil(round(q * len(sorted_values), 9))
+    index = min(len(sorted_values) - 1, max(0, rank - 1))
+    return sorted_values[index]
+
+
+def run_load(base_url: str, requests_plan: List[Tuple[str, str]], concurrency: int = 1) -> Dict[str, Any]:
+    """
+    Run a request plan and collect statistics.
+
+    Args:
+        base_url: API base URL (mock or real)
+        requests_plan: List of ``(endpoint, slug)`` pairs, endpoint being
+            ``'market'`` or ``'feed'``
+        concurrency: Number of worker threads; 1 runs the plain sync path
+
+    Returns:
+        Dictionary with request counts, requests per second and latency
+        percentiles in milliseconds
+    """
+    started = time.perf_counter()
+    if concurrency <= 1:
+        results = [_call(base_url, request) for request in requests_plan]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda request: _call(base_url, request), requests_plan))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    outcomes = {}
+    for _, outcome in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "rps": len(results) / elapsed if elapsed else 0.0,
+        "ok": outcomes.get('ok', 0),
+        "rate_limited": outcomes.get('rate_limited', 0),
+        "errors": outcomes.get('error', 0),
+        "p50_ms": percentile(latencies, 0.50),
+        "p90_ms": percentile(latencies, 0.90),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+def build_plan(slugs: List[str], total: int) -> List[Tuple[str, str]]:
+    """Alternate market-info and feed-event requests across the given markets."""
+    plan = []
+    for i in range(total):
+        endpoint = 'market' if i % 2 == 0 else 'feed'
+        plan.append((endpoint, slugs[(i // 2) % len(slugs)]))
+    return plan
+
+
+def print_report(label: str, stats: Dict[str, Any]) -> None:
+    print(f"{label:<12} {stats['concurrency']:>5} {stats['requests']:>8} {stats['rps']:>9.1f} "
+          f"{stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+          f"{stats['ok']:>6} {stats['rate_limited']:>6} {stats['errors']:>6}")
+
+
+def main():
+    """Run the sync and concurrent benchmarks."""
+    parser = argparse.ArgumentParser(description="Load test the Limitless API client.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32],
+                        help="Thread counts for the concurrent runs")
+    parser.add_argument("--base-url", default=None,
+                        help="Benchmark an already running server instead of an in-process mock")
+    parser.add_argument("--data", default="limitless_data_*.json", help="Glob of archived data files")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    archive = load_archive(args.data)
+    if not archive:
+        print("No data files found. Please run the API client first.")
+        return
+
+    server: Optional[Any] = None
+    base_url = args.base_url
+    if base_url is None:
+        behavior = MockBehavior(args.latency_ms, args.jitter_ms, args.error_rate,
+                                args.rate_limit_rate, seed=args.seed)
+        server = start_mock_server(archive, behavior)
+        base_url = server.base_url
+
+    print("Limitless API Client - Load Test")
+    print("=" * 80)
+    print(f"Target: {base_url} ({len(archive)} markets, {args.requests} requests per run)")
+    print("=" * 80)
+    print(f"{'Mode':<12} {'Conc':>5} {'Requests':>8} {'Req/s':>9} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'OK':>6} {'429':>6} {'Err':>6}")
+    print("-" * 80)
+
+    plan = build_plan(list(archive), args.requests)
+    try:
+        print_report("sync", run_load(base_url, plan))
+        for concurrency in args.concurrency:
+            print_report("concurrent", run_load(base_url, plan, concurrency))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
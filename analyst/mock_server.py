@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Mock Limitless Exchange API Server
+Replays archived limitless_data_*.json payloads locally, with configurable
+latency, error rates and rate limiting, for offline testing of the client.
+"""
+
+import argparse
+import glob
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+_MARKET_PATH = re.compile(r'^/markets/([^/]+)$')
+_FEED_PATH = re.compile(r'^/markets/([^/]+)/get-feed-events$')
+
+
+def load_archive(pattern: str = "limitless_data_*.json") -> Dict[str, Dict[str, Any]]:
+    """
+    Load archived payloads keyed by market slug.
+
+    Args:
+        pattern: Glob pattern of data files written by the API client
+
+    Returns:
+        Dictionary mapping slug to ``{"market_info": <encoded JSON>, "events": [...]}``
+    """
+    archive = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        slug = data.get('market_slug') or data.get('market_info', {}).get('slug')
+        if not slug:
+            continue
+        feed_events = data.get('feed_events') or {}
+        if not feed_events.get('events'):
+            feed_events = {"events": data.get('feed_events_from_market_info', [])}
+        archive[slug] = {
+            "market_info": json.dumps(data.get('market_info', {})).encode('utf-8'),
+            "events": feed_events.get('events', []),
+        }
+    return archive
+
+
+class MockBehavior:
+    """Fault-injection settings shared by all request handlers."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: int = 1, seed: Optional[int] = None):
+        """
+        Initialize the behavior.
+
+        Args:
+            latency_ms: Base delay added to every response
+            jitter_ms: Uniform random delay added on top of ``latency_ms``
+            error_rate: Fraction of requests answered with 500
+            rate_limit_rate: Fraction of requests answered with 429
+            retry_after: ``Retry-After`` seconds sent with 429 responses
+            seed: Random seed for reproducible fault injection
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    def fault(self) -> Optional[int]:
+        """Return an injected status code for this request, or None."""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+
+class MockLimitlessHandler(BaseHTTPRequestHandler):
+    """Serves ``/markets/{slug}`` and ``/markets/{slug}/get-feed-events``."""
+
+    server_version = "MockLimitless/1.0"
+    protocol_version = "HTTP/1.1"
+    # Keep-alive responses are written in two parts; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(payload).encode('utf-8'), headers)
+
+    def _route(self, path: str, query: Dict[str, list]) -> Tuple[int, bytes]:
+        archive = self.server.archive
+
+        match = _MARKET_PATH.match(path)
+        if match:
+            market = archive.get(match.group(1))
+            if market is None:
+                return 404, json.dumps({"message": "Market not found"}).encode('utf-8')
+            return 200, market["market_info"]
+
+        match = _FEED_PATH.match(path)
+        if match:
+            market = archive.get(match.group(1))
+            if market is None:
+                return 404, json.dumps({"message": "Market not found"}).encode('utf-8')
+            try:
+                limit = int(query.get('limit', ['100'])[0])
+                page = int(query.get('page', ['1'])[0])
+            except ValueError:
+                return 400, json.dumps({"message": "Invalid pagination parameters"}).encode('utf-8')
+            events = market["events"]
+            limit = max(limit, 1)
+            start = (max(page, 1) - 1) * limit
+            return 200, json.dumps({
+                "events": events[start:start + limit],
+                "totalPages": max(1, -(-len(events) // limit)),
+                "pageSize": limit,
+            }).encode('utf-8')
+
+        return 404, json.dumps({"message": "Not found"}).encode('utf-8')
+
+    def do_GET(self) -> None:
+        behavior = self.server.behavior
+        delay = behavior.delay()
+        if delay:
+            time.sleep(delay)
+
+        fault = behavior.fault()
+        if fault == 429:
+            self._send_json(429, {"message": "Too Many Requests"},
+                            {'Retry-After': str(behavior.retry_after)})
+            return
+        if fault == 500:
+            self._send_json(500, {"message": "Injected server error"})
+            return
+
+        url = urlparse(self.path)
+        status, body = self._route(url.path, parse_qs(url.query))
+        self._send(status, body)
+
+
+class MockLimitlessServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the replay archive and fault settings."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], archive: Dict[str, Dict[str, Any]],
+                 behavior: Optional[MockBehavior] = None, verbose: bool = False):
+        super().__init__(address, MockLimitlessHandler)
+        self.archive = archive
+        self.behavior = behavior or MockBehavior()
+        self.verbose = verbose
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_mock_server(archive: Optional[Dict[str, Dict[str, Any]]] = None,
+                      behavior: Optional[MockBehavior] = None,
+                      host: str = "127.0.0.1", port: int = 0) -> MockLimitlessServer:
+    """
+    Start a mock server on a background thread.
+
+    Args:
+        archive: Replay archive (default: local data files)
+        behavior: Fault-injection settings
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+    server = MockLimitlessServer((host, port), archive if archive is not None else load_archive(), behavior)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    """Run the mock server in the foreground."""
+    parser = argparse.ArgumentParser(description="Replay archived Limitless API payloads locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data", default="limitless_data_*.json", help="Glob of archived data files")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    archive = load_archive(args.data)
+    behavior = MockBehavior(args.latency_ms, args.jitter_ms, args.error_rate,
+                            args.rate_limit_rate, args.retry_after, args.seed)
+    server = MockLimitlessServer((args.host, args.port), archive, behavior, args.verbose)
+
+    print("=" * 60)
+    print("Mock Limitless Exchange API")
+    print("=" * 60)
+    print(f"Serving {len(archive)} markets at {server.base_url}")
+    for slug in archive:
+        print(f"  {server.base_url}/markets/{slug}")
+    print("=" * 60)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Mergeable Market Sketches
+Approximate distinct-trader counts (HyperLogLog) and trade-size quantiles
+(t-digest) that can be persisted per market and combined across markets.
+"""
+
+import base64
+import glob
+import hashlib
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+
+SKETCH_DIR = "sketches"
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over string keys."""
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize the counter.
+
+        Args:
+            precision: Number of index bits; uses 2**precision one-byte registers
+                (standard error is about 1.04 / sqrt(2**precision))
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> float:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is far more accurate for small cardinalities
+            return m * math.log(m / zeros)
+        return estimate
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(bytes(self.registers)).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["precision"])
+        sketch.registers = bytearray(base64.b64decode(data["registers"]))
+        return sketch
+
+
+class TDigest:
+    """Merging t-digest for streaming quantile estimates."""
+
+    def __init__(self, compression: float = 100):
+        """
+        Initialize the digest.
+
+        Args:
+            compression: Accuracy/size trade-off; the digest keeps roughly this
+                many centroids
+        """
+        self.compression = compression
+        self.centroids: List[List[float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[List[float]] = []
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Add a value to the digest."""
+        self._buffer.append([value, weight])
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 10 * self.compression:
+            self._compress()
+
+    def _k_limit(self, q: float) -> float:
+        """Return the quantile where the centroid starting at ``q`` must end."""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        k_max = self.compression / 4
+        if k >= k_max:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        points = sorted(self.centroids + self._buffer)
+        self._buffer = []
+
+        merged = [list(points[0])]
+        cumulative = 0.0
+        limit = self._k_limit(0.0) * self.count
+        for mean, weight in points[1:]:
+            current = merged[-1]
+            if cumulative + current[1] + weight <= limit:
+                current[1] += weight
+                current[0] += (mean - current[0]) * weight / current[1]
+            else:
+                cumulative += current[1]
+                limit = self._k_limit(cumulative / self.count) * self.count
+                merged.append([mean, weight])
+        self.centroids = merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the value at quantile ``q`` (0..1), or None if empty."""
+        self._compress()
+        if not self.centroids:
+            return None
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+
+        target = q * self.count
+        cumulative = 0.0
+        previous_mean, previous_center = self.min, 0.0
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                fraction = (target - previous_center) / span if span else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            previous_mean, previous_center = mean, center
+            cumulative += weight
+        span = self.count - previous_center
+        fraction = (target - previous_center) / span if span else 1.0
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold another digest into this one."""
+        other._compress()
+        if other.count:
+            self._buffer.extend([mean, weight] for mean, weight in other.centroids)
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "centroids": self.centroids,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.centroids = [list(c) for c in data["centroids"]]
+        digest.count = data["count"]
+        if digest.count:
+            digest.min = data["min"]
+            digest.max = data["max"]
+        return digest
+
+
+class MarketSketch:
+    """Per-market summary: distinct traders, trade sizes and exact totals."""
+
+    def __init__(self, market_slug: str, market_id: Optional[int] = None):
+        self.market_slug = market_slug
+        self.market_id = market_id
+        self.trades = 0
+        self.volume = 0.0
+        self.traders = HyperLogLog()
+        self.trade_sizes = TDigest()
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """Add a single feed event to the sketch."""
+        account = event.get('user', {}).get('account')
+        if account:
+            # Addresses come back checksum-cased; normalise so markets agree
+            self.traders.add(account.lower())
+
+        if event.get('eventType') == 'NEW_TRADE':
+            self.trades += 1
+        amount = event.get('data', {}).get('tradeAmountUSD')
+        if amount:
+            self.volume += float(amount)
+            self.trade_sizes.add(float(amount))
+
+    def merge(self, other: "MarketSketch") -> "MarketSketch":
+        """Fold another market's sketch into this one."""
+        self.trades += other.trades
+        self.volume += other.volume
+        self.traders.merge(other.traders)
+        self.trade_sizes.merge(other.trade_sizes)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "market_slug": self.market_slug,
+            "market_id": self.market_id,
+            "trades": self.trades,
+            "volume": self.volume,
+            "traders": self.traders.to_dict(),
+            "trade_sizes": self.trade_sizes.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MarketSketch":
+        sketch = cls(data["market_slug"], data.get("market_id"))
+        sketch.trades = data["trades"]
+        sketch.volume = data["volume"]
+        sketch.traders = HyperLogLog.from_dict(data["traders"])
+        sketch.trade_sizes = TDigest.from_dict(data["trade_sizes"])
+        return sketch
+
+
+def build_market_sketch(market_slug: str, feed_events: Iterable[Dict[str, Any]],
+                        market_id: Optional[int] = None) -> MarketSketch:
+    """Build a sketch for one market from its feed events."""
+    sketch = MarketSketch(market_slug, market_id)
+    for event in feed_events:
+        sketch.add_event(event)
+    return sketch
+
+
+def save_sketch(sketch: MarketSketch, directory: str = SKETCH_DIR) -> str:
+    """Persist a market sketch as ``<directory>/<slug>.json`` and return the path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{sketch.market_slug}.json")
+    with open(path, 'w') as f:
+        json.dump(sketch.to_dict(), f)
+    return path
+
+
+def load_sketches(directory: str = SKETCH_DIR) -> Dict[str, MarketSketch]:
+    """Load every persisted market sketch, keyed by market slug."""
+    sketches = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, 'r') as f:
+            sketch = MarketSketch.from_dict(json.load(f))
+        sketches[sketch.market_slug] = sketch
+    return sketches
+
+
+def merge_sketches(sketches: Iterable[MarketSketch], label: str = "combined") -> MarketSketch:
+    """Combine several market sketches into a new one."""
+    combined = MarketSketch(label)
+    for sketch in sketches:
+        combined.merge(sketch)
+    return combined
+
+
+def shared_traders(a: MarketSketch, b: MarketSketch) -> float:
+    """Estimate the number of traders active in both markets (inclusion-exclusion)."""
+    union = HyperLogLog(a.traders.precision).merge(a.traders).merge(b.traders)
+    return max(0.0, a.traders.count() + b.traders.count() - union.count())
+
+
+def main():
+    """Sketch every local data file and print cross-market statistics."""
+    from analyze_data import iter_feed_events, load_market_info
+
+    print("Limitless Exchange - Market Sketches")
+    print("=" * 80)
+
+    for data_file in sorted(glob.glob("limitless_data_*.json")):
+        market_info = load_market_info(data_file)
+        slug = market_info.get('slug') or os.path.splitext(os.path.basename(data_file))[0]
+        sketch = build_market_sketch(slug, iter_feed_events(data_file), market_info.get('id'))
+        print(f"Sketched {data_file} -> {save_sketch(sketch)}")
+
+    sketches = load_sketches()
+    if not sketches:
+        print("No sketches found. Please run the API client first.")
+        return
+
+    print(f"\n{'Market':<45} {'Traders':>8} {'Trades':>7} {'p50 USD':>10} {'p90 USD':>10}")
+    print("-" * 84)
+    for slug, sketch in sketches.items():
+        p50 = sketch.trade_sizes.quantile(0.5) or 0
+        p90 = sketch.trade_sizes.quantile(0.9) or 0
+        print(f"{slug[:44]:<45} {sketch.traders.count():>8.0f} {sketch.trades:>7} {p50:>10.2f} {p90:>10.2f}")
+
+    combined = merge_sketches(sketches.values(), label="all markets")
+    p50 = combined.trade_sizes.quantile(0.5) or 0
+    p90 = combined.trade_sizes.quantile(0.9) or 0
+    print("-" * 84)
+    print(f"{'All markets':<45} {combined.traders.count():>8.0f} {combined.trades:>7} {p50:>10.2f} {p90:>10.2f}")
+
+    slugs = list(sketches)
+    if len(slugs) >= 2:
+        overlap = shared_traders(sketches[slugs[0]], sketches[slugs[1]])
+        print(f"\nTraders active in both {slugs[0][:30]} and {slugs[1][:30]}: ~{overlap:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Round-trip tests for JSONStreamReader at chunk sizes small enough to split every token."""
+
+import glob
+import io
+import json
+import os
+
+import pytest
+
+from json_stream import JSONStreamReader
+
+
+CHUNK_SIZES = (1, 2, 3, 5, 7, 64 * 1024)
+
+DOCUMENT = {
+    "market_info": {
+        "title": "Will \"BTC\" close above $100,000? [daily] {test}",
+        "escapes": "back\\slash \\\" quote \n newline é 🚀",
+        "metadata": {"resolvePrice": 101234.5, "tags": [], "empty": {}},
+        "feedEvents": [{"nested": [[1, [2, [3]]], {"a": {"b": None}}]}],
+    },
+    "numbers": [0, -1, 3.25, 1e-7, -2.5E+10, 12345678901234567890],
+    "literals": [True, False, None],
+    "feed_events_from_market_info": [
+        {"eventType": "NEW_TRADE", "data": {"strategy": "Buy", "outcome": "YES", "tradeAmountUSD": 12.5}},
+        {"eventType": "RESOLVED", "data": {}},
+    ],
+}
+
+DATA_FILES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "limitless_data_*.json")))
+
+
+def reader_for(value, chunk_size, indent=None):
+    return JSONStreamReader(io.StringIO(json.dumps(value, indent=indent)), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_read_value_round_trip(chunk_size, indent):
+    assert reader_for(DOCUMENT, chunk_size, indent).read_value() == DOCUMENT
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("value", [0, -12.5, "text", "", True, None, [], {}])
+def test_top_level_scalars_and_empty_containers(chunk_size, value):
+    assert reader_for(value, chunk_size).read_value() == value
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_iter_object_and_array(chunk_size):
+    reader = reader_for(DOCUMENT, chunk_size, indent=2)
+    decoded = {}
+    for key in reader.iter_object():
+        if key == "feed_events_from_market_info":
+            decoded[key] = list(reader.iter_array())
+        elif key == "market_info":
+            decoded[key] = {field: reader.read_value() for field in reader.iter_object()}
+        # Other values are left for iter_object to skip
+
+    assert decoded == {
+        "market_info": DOCUMENT["market_info"],
+        "feed_events_from_market_info": DOCUMENT["feed_events_from_market_info"],
+    }
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_skip_value(chunk_size):
+    reader = reader_for(DOCUMENT, chunk_size)
+    kept = {}
+    for key in reader.iter_object():
+        if key == "literals":
+            kept[key] = reader.read_value()
+        else:
+            reader.skip_value()
+
+    assert kept == {"literals": DOCUMENT["literals"]}
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_truncated_input_raises(chunk_size):
+    text = json.dumps(DOCUMENT)[:-3]
+    with pytest.raises(ValueError):
+        JSONStreamReader(io.StringIO(text), chunk_size).read_value()
+
+
+@pytest.mark.skipif(not DATA_FILES, reason="no archived data files")
+@pytest.mark.parametrize("chunk_size", [1, 13, 4096])
+def test_archived_data_files(chunk_size):
+    for path in DATA_FILES:
+        with open(path, 'r') as f:
+            expected = json.load(f)
+        with open(path, 'r') as f:
+            assert JSONStreamReader(f, chunk_size).read_value() == expected
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Intraday Market Time Series
+Buckets YES/NO trade volume and counts into fixed intervals and computes
+rolling volume and sentiment, using numpy arrays built once per feed.
+"""
+
+import argparse
+import glob
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from trader_index import OUTCOMES, predicted_outcome
+
+
+# Interval suffixes accepted by parse_interval, as numpy timedelta units
+INTERVAL_UNITS = {'s': 's', 'm': 'm', 'h': 'h', 'd': 'D'}
+
+# Side codes: which outcome a trade bets on
+SIDE_YES = 0
+SIDE_NO = 1
+SIDE_UNKNOWN = -1
+
+
+def parse_interval(interval: str) -> np.timedelta64:
+    """
+    Parse an interval such as ``30s``, ``5m``, ``1h`` or ``1d``.
+
+    Args:
+        interval: Positive integer followed by a unit (s, m, h or d)
+
+    Returns:
+        The interval as a numpy timedelta
+    """
+    value, unit = interval[:-1], interval[-1:].lower()
+    if unit not in INTERVAL_UNITS or not value.isdigit() or int(value) <= 0:
+        raise ValueError(f"Invalid interval {interval!r}; use e.g. 30s, 5m, 1h or 1d")
+    return np.timedelta64(int(value), INTERVAL_UNITS[unit])
+
+
+class TradeArrays:
+    """Trades of one or more markets as parallel typed arrays, sorted by time."""
+
+    def __init__(self, timestamps: np.ndarray, amounts: np.ndarray, sides: np.ndarray,
+                 market_codes: np.ndarray, markets: List[str]):
+        order = np.argsort(timestamps, kind='stable')
+        self.timestamps = timestamps[order]
+        self.amounts = amounts[order]
+        self.sides = sides[order]
+        self.market_codes = market_codes[order]
+        self.markets = markets
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_events(cls, feed_events: Iterable[Dict[str, Any]], market: str = "unknown") -> "TradeArrays":
+        """
+        Convert a market's feed events into arrays in a single pass.
+
+        Args:
+            feed_events: Iterable of feed event dictionaries
+            market: Market label, usually the slug
+        """
+        builder = TradeArraysBuilder(market)
+        for event in feed_events:
+            builder.add_event(event)
+        return builder.build()
+
+    @classmethod
+    def concat(cls, parts: List["TradeArrays"]) -> "TradeArrays":
+        """Combine the trades of several markets, keeping each market's label."""
+        markets: List[str] = []
+        codes = []
+        for part in parts:
+            codes.append(part.market_codes + len(markets))
+            markets.extend(part.markets)
+        return cls(
+            np.concatenate([part.timestamps for part in parts]) if parts else np.array([], 'datetime64[ms]'),
+            np.concatenate([part.amounts for part in parts]) if parts else np.array([], np.float64),
+            np.concatenate([part.sides for part in parts]) if parts else np.array([], np.int8),
+            np.concatenate(codes) if parts else np.array([], np.int32),
+            markets,
+        )
+
+    def for_market(self, market: str) -> "TradeArrays":
+        """Trades of a single market."""
+        mask = self.market_codes == self.markets.index(market)
+        return TradeArrays(self.timestamps[mask], self.amounts[mask], self.sides[mask],
+                           np.zeros(int(mask.sum()), dtype=np.int32), [market])
+
+
+class TradeArraysBuilder:
+    """
+    Collects one market's trades event by event, for scans that also feed
+    other consumers; ``build`` converts them into arrays in one step.
+    """
+
+    def __init__(self, market: str = "unknown"):
+        self.market = market
+        self.timestamps: List[str] = []
+        self.amounts: List[Any] = []
+        self.sides: List[int] = []
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """
+        Add a single feed event.
+
+        Only ``NEW_TRADE`` events with a timestamp are kept. A trade's side is
+        the outcome it bets on (buying NO or selling YES is a NO bet).
+        """
+        timestamp = event.get('timestamp')
+        if event.get('eventType') != 'NEW_TRADE' or not timestamp:
+            return
+        data = event.get('data', {})
+        # numpy parses naive ISO timestamps; feed times are all UTC
+        self.timestamps.append(timestamp[:-1] if timestamp.endswith('Z') else timestamp)
+        self.amounts.append(data.get('tradeAmountUSD') or 0)
+        side = predicted_outcome(data.get('strategy', ''), data.get('outcome', ''))
+        self.sides.append(SIDE_UNKNOWN if side is None else OUTCOMES.index(side))
+
+    def build(self) -> TradeArrays:
+        """Parse the collected timestamps and amounts into typed arrays in one call each."""
+        return TradeArrays(
+            np.array(self.timestamps, dtype='datetime64[ms]'),
+            np.array(self.amounts, dtype=np.float64),
+            np.array(self.sides, dtype=np.int8),
+            np.zeros(len(self.timestamps), dtype=np.int32),
+            [self.market],
+        )
+
+
+class TimeSeries:
+    """YES/NO volume and trade counts per fixed-width time bucket."""
+
+    def __init__(self, bucket_starts: np.ndarray, interval: np.timedelta64,
+                 yes_volume: np.ndarray, no_volume: np.ndarray,
+                 yes_trades: np.ndarray, no_trades: np.ndarray):
+        self.bucket_starts = bucket_starts
+        self.interval = interval
+        self.yes_volume = yes_volume
+        self.no_volume = no_volume
+        self.yes_trades = yes_trades
+        self.no_trades = no_trades
+
+    def __len__(self) -> int:
+        return len(self.bucket_starts)
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.yes_volume + self.no_volume
+
+    @property
+    def trades(self) -> np.ndarray:
+        return self.yes_trades + self.no_trades
+
+    def rolling_volume(self, window: int) -> np.ndarray:
+        """Total volume over the last ``window`` buckets, ending at each bucket."""
+        return rolling_sum(self.volume, window)
+
+    def rolling_sentiment(self, window: int) -> np.ndarray:
+        """
+        YES share of volume over the last ``window`` buckets.
+
+        Returns NaN for windows without volume.
+        """
+        yes = rolling_sum(self.yes_volume, window)
+        total = yes + rolling_sum(self.no_volume, window)
+        return np.divide(yes, total, out=np.full(len(total), np.nan), where=total > 0)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sliding-window sums from a single cumulative sum.
+
+    Each window's sum is the difference of two prefix sums, so the cost is
+    O(n) regardless of the window length. Windows at the start cover the
+    buckets available so far.
+    """
+    if window <= 0:
+        raise ValueError("window must be positive")
+    prefix = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, len(values) + 1)
+    return prefix[ends] - prefix[np.maximum(ends - window, 0)]
+
+
+def bucket_trades(trades: TradeArrays, interval: str = "1m",
+                  origin: Optional[np.datetime64] = None) -> TimeSeries:
+    """
+    Bucket trades into fixed intervals.
+
+    Args:
+        trades: Trades to bucket (one or several markets)
+        interval: Bucket width, e.g. ``30s``, ``5m`` or ``1h``
+        origin: Start of the first bucket; defaults to the first trade's time
+            floored to the interval (measured from the Unix epoch)
+
+    Returns:
+        Time series with one bucket per interval, including empty buckets
+    """
+    step = parse_interval(interval).astype('timedelta64[ms]')
+    if not len(trades):
+        empty = np.array([], dtype=np.float64)
+        return TimeSeries(np.array([], dtype='datetime64[ms]'), step, empty, empty, empty, empty)
+
+    if origin is None:
+        epoch = np.datetime64(0, 'ms')
+        origin = epoch + (trades.timestamps[0] - epoch) // step * step
+    buckets = (trades.timestamps - origin) // step
+    if buckets[0] < 0:
+        raise ValueError("origin is after the first trade")
+    size = int(buckets[-1]) + 1
+
+    yes = trades.sides == SIDE_YES
+    no = trades.sides == SIDE_NO
+    return TimeSeries(
+        origin + np.arange(size) * step,
+        step,
+        np.bincount(buckets[yes], weights=trades.amounts[yes], minlength=size),
+        np.bincount(buckets[no], weights=trades.amounts[no], minlength=size),
+        np.bincount(buckets[yes], minlength=size),
+        np.bincount(buckets[no], minlength=size),
+    )
+
+
+class TimeSeriesBuilder:
+    """
+    Buckets one market's trades event by event in bounded memory.
+
+    Trades are collected in chunks of ``chunk_size``; each full chunk is
+    bucketed and added to the running series, so memory grows with the number
+    of buckets rather than the number of trades.
+    """
+
+    def __init__(self, interval: str = "1m", market: str = "unknown", chunk_size: int = 65536):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.interval = interval
+        self.market = market
+        self.chunk_size = chunk_size
+        self._chunk = TradeArraysBuilder(market)
+        self._series: Optional[TimeSeries] = None
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """Add a single feed event (see ``TradeArraysBuilder.add_event``)."""
+        self._chunk.add_event(event)
+        if len(self._chunk.timestamps) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._chunk.timestamps:
+            return
+        part = bucket_trades(self._chunk.build(), self.interval)
+        self._chunk = TradeArraysBuilder(self.market)
+        self._series = part if self._series is None else add_series(self._series, part)
+
+    def build(self) -> TimeSeries:
+        """Bucket the remaining trades and return the series of everything added."""
+        self._flush()
+        if self._series is None:
+            return bucket_trades(self._chunk.build(), self.interval)
+        return self._series
+
+
+def add_series(a: TimeSeries, b: TimeSeries) -> TimeSeries:
+    """
+    Sum two series of the same interval bucket by bucket.
+
+    Both series must use epoch-aligned buckets, as ``bucket_trades`` does by
+    default. The result spans both series, including empty buckets between them.
+    """
+    if a.interval != b.interval:
+        raise ValueError("series have different intervals")
+    if not len(a):
+        return b
+    if not len(b):
+        return a
+
+    step = a.interval
+    origin = min(a.bucket_starts[0], b.bucket_starts[0])
+    size = int((max(a.bucket_starts[-1], b.bucket_starts[-1]) - origin) // step) + 1
+
+    fields = []
+    for name in ('yes_volume', 'no_volume', 'yes_trades', 'no_trades'):
+        total = np.zeros(size, dtype=np.result_type(getattr(a, name), getattr(b, name)))
+        for series in (a, b):
+            offset = int((series.bucket_starts[0] - origin) // step)
+            total[offset:offset + len(series)] += getattr(series, name)
+        fields.append(total)
+    return TimeSeries(origin + np.arange(size) * step, step, *fields)
+
+
+def load_trade_arrays(paths: Iterable[str]) -> TradeArrays:
+    """Load the trades of archived ``limitless_data_*.json`` files, one market per file."""
+    from analyze_data import read_data_file
+
+    parts = []
+    for path in paths:
+        market_info, feed_events = read_data_file(path)
+        market = market_info.get('slug') or os.path.splitext(os.path.basename(path))[0]
+        parts.append(TradeArrays.from_events(feed_events, market))
+    return TradeArrays.concat(parts)
+
+
+def print_time_series(series: TimeSeries, window: int, label: str, rows: int = 20) -> None:
+    """Print the non-empty buckets of a series with rolling volume and sentiment."""
+    print("\n" + "="*60)
+    print(f"INTRADAY TIME SERIES: {label}")
+    print("="*60)
+
+    if not len(series):
+        print("No trades found.")
+        return
+
+    interval_seconds = series.interval.astype('timedelta64[s]').astype(int)
+    print(f"Buckets: {len(series)} x {interval_seconds}s, rolling window: {window} buckets")
+
+    rolling_volume = series.rolling_volume(window)
+    rolling_sentiment = series.rolling_sentiment(window)
+    active = np.flatnonzero(series.trades)
+    peak = int(np.argmax(series.volume))
+    print(f"Active Buckets: {len(active)}")
+    print(f"Peak Bucket: {series.bucket_starts[peak]} (${series.volume[peak]:,.2f})")
+
+    print(f"\n{'Bucket (UTC)':<24} {'YES $':>10} {'NO $':>10} {'Trades':>7} {'Roll $':>11} {'Roll YES%':>10}")
+    print("-" * 77)
+    for i in active[-rows:]:
+        sentiment = rolling_sentiment[i]
+        sentiment_text = "N/A" if np.isnan(sentiment) else f"{sentiment*100:.1f}"
+        print(f"{str(series.bucket_starts[i]):<24} {series.yes_volume[i]:>10.2f} {series.no_volume[i]:>10.2f} "
+              f"{int(series.trades[i]):>7} {rolling_volume[i]:>11.2f} {sentiment_text:>10}")
+    if len(active) > rows:
+        print(f"... {len(active) - rows} earlier active buckets not shown")
+
+
+def main():
+    """Build per-market and combined time series from archived data files."""
+    parser = argparse.ArgumentParser(description="Intraday YES/NO volume and sentiment time series.")
+    parser.add_argument("--data", default="limitless_data_*.json", help="Glob of archived data files")
+    parser.add_argument("--interval", default="1m", help="Bucket width, e.g. 30s, 5m, 1h (default: 1m)")
+    parser.add_argument("--window", type=int, default=5, help="Rolling window in buckets (default: 5)")
+    parser.add_argument("--rows", type=int, default=20, help="Active buckets to print per series")
+    parser.add_argument("--combined", action="store_true", help="Also print all markets combined")
+    args = parser.parse_args()
+
+    print("Limitless Exchange - Intraday Time Series")
+    print("=" * 80)
+
+    paths = sorted(glob.glob(args.data))
+    if not paths:
+        print("No data files found. Please run the API client first.")
+        return
+
+    trades = load_trade_arrays(paths)
+    print(f"Loaded {len(trades)} trades from {len(trades.markets)} markets")
+
+    for market in trades.markets:
+        series = bucket_trades(trades.for_market(market), args.interval)
+        print_time_series(series, args.window, market, args.rows)
+    if args.combined and len(trades.markets) > 1:
+        print_time_series(bucket_trades(trades, args.interval), args.window, "all markets", args.rows)
+
+
+if __name__ == "__main__":
+    main()
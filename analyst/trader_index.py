@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Trader Accuracy Index
+Tracks per-wallet prediction accuracy, volume and realized PnL across
+resolved markets, updated incrementally as archived markets are ingested.
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+
+INDEX_PATH = "trader_index.json"
+
+# Outcome names by winningOutcomeIndex (0 = YES, 1 = NO)
+OUTCOMES = ("YES", "NO")
+
+RANKINGS = ("pnl", "hit_rate", "volume", "roi")
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {
+        "display_name": None,
+        "markets": 0,
+        "predictions": 0,
+        "correct": 0,
+        "volume": 0.0,
+        "pnl": 0.0,
+    }
+
+
+def predicted_outcome(strategy: str, outcome: str) -> Optional[str]:
+    """Outcome a trade bets on: buying an outcome or selling its complement."""
+    if outcome not in OUTCOMES:
+        return None
+    if strategy.upper() == 'BUY':
+        return outcome
+    if strategy.upper() == 'SELL':
+        return OUTCOMES[1 - OUTCOMES.index(outcome)]
+    return None
+
+
+class TraderIndex:
+    """Wallet-keyed accuracy index over resolved markets."""
+
+    def __init__(self):
+        self.traders: Dict[str, Dict[str, Any]] = {}
+        self.markets: Dict[str, Dict[str, Any]] = {}
+
+    def ingest_market(self, market_info: Dict[str, Any], feed_events: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Fold one resolved market into the index.
+
+        A market already in the index is re-ingested when ``feed_events``
+        holds more events than it was ingested from: its previous
+        contribution to each wallet is subtracted before the new one is added.
+
+        Args:
+            market_info: Market information (needs ``id``, ``status`` and
+                ``winningOutcomeIndex``)
+            feed_events: The market's feed events
+
+        Returns:
+            True if the market was ingested, False if it is unresolved or the
+            index already covers at least as many of its events
+        """
+        market_id = str(market_info.get('id'))
+        winning_index = market_info.get('winningOutcomeIndex')
+        if market_info.get('status') != 'RESOLVED' or winning_index not in (0, 1):
+            return False
+        previous = self.markets.get(market_id)
+        if previous is not None and "wallets" not in previous:
+            # Indexed before per-market contributions were kept; cannot be undone
+            return False
+        winner = OUTCOMES[winning_index]
+
+        # Per wallet: cash flow and net contracts per outcome for this market
+        positions: Dict[str, Dict[str, Any]] = {}
+        events = 0
+        for event in feed_events:
+            events += 1
+            if event.get('eventType') != 'NEW_TRADE':
+                continue
+            user = event.get('user', {})
+            trade = event.get('data', {})
+            account = user.get('account')
+            strategy = trade.get('strategy', '')
+            outcome = trade.get('outcome')
+            if not account or predicted_outcome(strategy, outcome) is None:
+                continue
+
+            wallet = account.lower()
+            amount = float(trade.get('tradeAmountUSD') or 0)
+            contracts = float(trade.get('contracts') or 0)
+            position = positions.setdefault(wallet, {
+                "display_name": user.get('displayName'),
+                "predictions": 0,
+                "correct": 0,
+                "volume": 0.0,
+                "cash_flow": 0.0,
+                "contracts": {name: 0.0 for name in OUTCOMES},
+            })
+            position["predictions"] += 1
+            position["correct"] += predicted_outcome(strategy, outcome) == winner
+            position["volume"] += amount
+            if strategy.upper() == 'BUY':
+                position["cash_flow"] -= amount
+                position["contracts"][outcome] += contracts
+            else:
+                position["cash_flow"] += amount
+                position["contracts"][outcome] -= contracts
+
+        if previous is not None:
+            if events <= previous.get("events", 0):
+                return False
+            self._remove_market(market_id)
+
+        # Per wallet: [predictions, correct, volume, pnl] this market added
+        contributions: Dict[str, List[float]] = {}
+        for wallet, position in positions.items():
+            stats = self.traders.setdefault(wallet, _new_stats())
+            if position["display_name"]:
+                stats["display_name"] = position["display_name"]
+            # Each winning contract redeems for 1 USD
+            pnl = position["cash_flow"] + position["contracts"][winner]
+            contributions[wallet] = [position["predictions"], position["correct"], position["volume"], pnl]
+            stats["markets"] += 1
+            stats["predictions"] += position["predictions"]
+            stats["correct"] += position["correct"]
+            stats["volume"] += position["volume"]
+            stats["pnl"] += pnl
+
+        self.markets[market_id] = {
+            "slug": market_info.get('slug'),
+            "winner": winner,
+            "traders": len(positions),
+            "events": events,
+            "wallets": contributions,
+        }
+        return True
+
+    def _remove_market(self, market_id: str) -> None:
+        """Subtract a market's contributions from every wallet that traded it."""
+        for wallet, (predictions, correct, volume, pnl) in self.markets.pop(market_id)["wallets"].items():
+            stats = self.traders[wallet]
+            stats["markets"] -= 1
+            stats["predictions"] -= predictions
+            stats["correct"] -= correct
+            stats["volume"] -= volume
+            stats["pnl"] -= pnl
+            if not stats["markets"]:
+                del self.traders[wallet]
+
+    def lookup(self, wallet: str) -> Optional[Dict[str, Any]]:
+        """Return a wallet's stats (with derived hit rate and ROI), or None."""
+        stats = self.traders.get(wallet.lower())
+        if stats is None:
+            return None
+        return self._row(wallet.lower(), stats)
+
+    @staticmethod
+    def _row(wallet: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(stats, wallet=wallet)
+        row["hit_rate"] = stats["correct"] / stats["predictions"] if stats["predictions"] else 0.0
+        row["roi"] = stats["pnl"] / stats["volume"] if stats["volume"] else 0.0
+        return row
+
+    def top(self, k: int = 10, by: str = "pnl", min_markets: int = 1) -> List[Dict[str, Any]]:
+        """
+        Return the top ``k`` traders.
+
+        Args:
+            k: Number of traders to return
+            by: Ranking key, one of ``RANKINGS``
+            min_markets: Ignore wallets active in fewer resolved markets
+
+        Returns:
+            Trader rows sorted best first
+        """
+        if by not in RANKINGS:
+            raise ValueError(f"Unknown ranking {by!r}; expected one of {', '.join(RANKINGS)}")
+        rows = (self._row(wallet, stats) for wallet, stats in self.traders.items()
+                if stats["markets"] >= min_markets)
+        return heapq.nlargest(k, rows, key=lambda row: (row[by], row["volume"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"markets": self.markets, "traders": self.traders}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TraderIndex":
+        index = cls()
+        index.markets = data.get("markets", {})
+        index.traders = data.get("traders", {})
+        return index
+
+    def save(self, path: str = INDEX_PATH) -> None:
+        """Persist the index, replacing the file atomically."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH) -> "TraderIndex":
+        """Load a persisted index, or return an empty one if none exists."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def main():
+    """Ingest local data files and print the trader rankings."""
+    from analyze_data import iter_archived_events, load_market_info
+
+    parser = argparse.ArgumentParser(description="Rank traders by accuracy across resolved markets.")
+    parser.add_argument("--index", default=INDEX_PATH, help="Index file to update")
+    parser.add_argument("--data", default="limitless_data_*.json", help="Glob of archived data files")
+    parser.add_argument("--top", type=int, default=10, help="Number of traders to show")
+    parser.add_argument("--by", choices=RANKINGS, default="pnl", help="Ranking key")
+    parser.add_argument("--min-markets", type=int, default=1)
+    parser.add_argument("--wallet", default=None, help="Show stats for a single wallet")
+    args = parser.parse_args()
+
+    print("Limitless Exchange - Trader Accuracy Index")
+    print("=" * 80)
+
+    index = TraderIndex.load(args.index)
+    ingested = 0
+    for data_file in sorted(glob.glob(args.data)):
+        if index.ingest_market(load_market_info(data_file), iter_archived_events(data_file)):
+            ingested += 1
+            print(f"Ingested {data_file}")
+    if ingested:
+        index.save(args.index)
+    print(f"Index covers {len(index.markets)} resolved markets and {len(index.traders)} traders")
+
+    if args.wallet:
+        stats = index.lookup(args.wallet)
+        if stats is None:
+            print(f"\nWallet {args.wallet} not found")
+            return
+        print(f"\nWallet: {stats['wallet']} ({stats['display_name']})")
+        print(f"  Markets: {stats['markets']}")
+        print(f"  Hit Rate: {stats['hit_rate']*100:.1f}% ({stats['correct']}/{stats['predictions']})")
+        print(f"  Volume: ${stats['volume']:,.2f}")
+        print(f"  Realized PnL: ${stats['pnl']:,.2f} (ROI {stats['roi']*100:.1f}%)")
+        return
+
+    print(f"\nTop {args.top} traders by {args.by}:")
+    print(f"{'#':>3} {'Wallet':<44} {'Mkts':>5} {'Hit %':>6} {'Volume':>11} {'PnL':>11}")
+    print("-" * 84)
+    for rank, row in enumerate(index.top(args.top, args.by, args.min_markets), 1):
+        print(f"{rank:>3} {row['wallet']:<44} {row['markets']:>5} {row['hit_rate']*100:>6.1f} "
+              f"{row['volume']:>11.2f} {row['pnl']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
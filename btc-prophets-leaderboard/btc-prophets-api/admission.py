@@ -0,0 +1,94 @@
+"""Admission control for expensive leaderboard computations."""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; the caller should shed it."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded wait queue.
+
+    At most ``max_concurrent`` computations run at once in this process. Up to
+    ``max_queue`` further requests wait, each for at most ``queue_timeout``
+    seconds; anything beyond that is rejected immediately, so admitted
+    requests keep predictable latency under overload instead of all slowing
+    down together.
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16,
+                 queue_timeout: float = 5.0, retry_after: int = 5):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._waiting = 0
+        self._active = 0
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a computation slot for the duration of the block.
+
+        Raises
+        ------
+        AdmissionRejected
+            If the wait queue is full or no slot frees up within ``queue_timeout``
+        """
+        if self._semaphore.locked():
+            if self._waiting >= self.max_queue:
+                raise AdmissionRejected("Leaderboard queue is full", self.retry_after)
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise AdmissionRejected("Timed out waiting for a leaderboard slot", self.retry_after)
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+def worker_share(total: int, workers: int) -> int:
+    """
+    Per-process share of a concurrency budget split across ``workers`` processes.
+
+    Every process gets at least one slot, so with more workers than budget the
+    effective total is one computation per worker.
+    """
+    return max(1, total // max(1, workers))
+
+# Leaderboard computations allowed across all worker processes; each runs three
+# leg queries, so the database sees up to three times this many
+MAX_CONCURRENT_TOTAL = int(os.getenv("LEADERBOARD_MAX_CONCURRENT", "4"))
+
+# Global admission controller for this worker process; uvicorn workers inherit
+# WEB_CONCURRENCY from main.py, so each takes its share of the budget
+leaderboard_admission = AdmissionController(
+    max_concurrent=worker_share(MAX_CONCURRENT_TOTAL, int(os.getenv("WEB_CONCURRENCY", "1"))),
+    max_queue=int(os.getenv("LEADERBOARD_MAX_QUEUE", "16")),
+    queue_timeout=float(os.getenv("LEADERBOARD_QUEUE_TIMEOUT", "5")),
+    retry_after=int(os.getenv("LEADERBOARD_RETRY_AFTER", "5")),
+)
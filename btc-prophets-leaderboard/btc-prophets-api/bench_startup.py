@@ -0,0 +1,129 @@
+"""Cold-start import benchmark for the API process."""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that should not be loaded until the first leaderboard request
+DEFERRED_MODULES = ("pandas", "sqlalchemy")
+
+CHECK_DEFERRED = (
+    "import sys; "
+    "print(','.join(m for m in {modules!r} if m in sys.modules))"
+)
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+def measure_wall_time(module: str, runs: int) -> List[float]:
+    """
+    Time ``import <module>`` in fresh interpreters.
+
+    Parameters
+    ----------
+    module : str
+        Module to import, e.g. 'main'
+    runs : int
+        Number of cold interpreters to start
+
+    Returns
+    -------
+    List[float]
+        Import time in milliseconds for each run, excluding interpreter startup
+    """
+    timings = []
+    for _ in range(runs):
+        result = _run([
+            "-c",
+            f"import time; t = time.perf_counter(); import {module}; "
+            "print((time.perf_counter() - t) * 1000)",
+        ])
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+def profile_imports(code: str) -> List[Tuple[str, int, int]]:
+    """
+    Run ``python -X importtime -c <code>``.
+
+    Returns
+    -------
+    List[Tuple[str, int, int]]
+        (module, self microseconds, cumulative microseconds) for every import;
+        module names keep the indentation importtime uses for nested imports
+    """
+    result = _run(["-X", "importtime", "-c", code])
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return entries
+
+def slowest_imports(module: str) -> List[Tuple[str, int]]:
+    """
+    Imports triggered by the module, slowest first.
+
+    Modules the bare interpreter already loads at startup are left out.
+
+    Returns
+    -------
+    List[Tuple[str, int]]
+        (module, cumulative microseconds), sorted descending
+    """
+    baseline = {name.strip() for name, _, _ in profile_imports("pass")}
+    costs = [
+        (name.strip(), cumulative_us)
+        for name, _, cumulative_us in profile_imports(f"import {module}")
+        if name.strip() not in baseline
+    ]
+    return sorted(costs, key=lambda item: item[1], reverse=True)
+
+def deferred_modules_loaded(module: str) -> List[str]:
+    """Which of DEFERRED_MODULES are loaded by importing the module."""
+    result = _run(["-c", f"import {module}; " + CHECK_DEFERRED.format(modules=DEFERRED_MODULES)])
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    return [name for name in loaded.split(",") if name]
+
+def run_benchmark(module: str = "main", runs: int = 10, top: int = 15) -> None:
+    """Print import timings, the costliest imports and any eagerly loaded heavy modules."""
+    started = time.perf_counter()
+    timings = measure_wall_time(module, runs)
+
+    print(f"import {module}: {runs} cold runs")
+    print(
+        f"  median {statistics.median(timings):.1f} ms, "
+        f"min {min(timings):.1f} ms, max {max(timings):.1f} ms"
+    )
+
+    print(f"\nSlowest {top} imports by cumulative time:")
+    for name, cumulative_us in slowest_imports(module)[:top]:
+        print(f"  {name:<40} {cumulative_us / 1000:8.1f} ms")
+
+    loaded = deferred_modules_loaded(module)
+    if loaded:
+        print(f"\nLoaded at import (should be deferred): {', '.join(loaded)}")
+    else:
+        print(f"\nDeferred until first use: {', '.join(DEFERRED_MODULES)}")
+    print(f"\nBenchmark finished in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the API.")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=10, help="Cold interpreter runs (default: 10)")
+    parser.add_argument("--top", type=int, default=15, help="Imports to list (default: 15)")
+    args = parser.parse_args()
+
+    run_benchmark(args.module, args.runs, args.top)
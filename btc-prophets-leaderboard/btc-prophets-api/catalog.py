@@ -0,0 +1,227 @@
+"""In-memory market catalog with incremental refresh."""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Set
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+# BTC classification is evaluated by Postgres, but only for changed rows
+CATALOG_QUERY = """
+select
+    id as market_id,
+    address,
+    created_at::date as created_date,
+    deadline::date as deadline_date,
+    status,
+    CASE WHEN winning_index = 1 THEN 'NO' ELSE 'YES' END as resolution,
+    (lower(title) LIKE '%btc%' or lower(description) LIKE '%bitcoin%') as is_btc,
+    updated_at
+from public.markets
+"""
+
+class MarketRecord(NamedTuple):
+    """Catalog entry for a single market."""
+
+    address: Optional[str]
+    created_date: Optional[date]
+    deadline_date: Optional[date]
+    status: Optional[str]
+    resolution: str
+    is_btc: bool
+
+    @property
+    def is_leaderboard_market(self) -> bool:
+        """Resolved BTC market lasting at most a day, as counted on the leaderboard."""
+        return (
+            self.is_btc
+            and self.status == 'RESOLVED'
+            and self.created_date is not None
+            and self.deadline_date is not None
+            and (self.deadline_date - self.created_date).days <= 1
+        )
+
+class MarketCatalog:
+    """
+    Process-local copy of ``public.markets`` for leaderboard queries.
+
+    The catalog is bulk-loaded once and then refreshed incrementally from
+    ``updated_at``, so classifying and resolving markets is a dictionary
+    lookup instead of two scans of the markets table per request.
+
+    ``updated_at`` is set when a row is written, not when its transaction
+    commits, so a row can become visible with a timestamp older than the
+    high-water mark. Incremental refreshes therefore re-read an ``overlap``
+    window behind the mark, and a background thread reloads the whole
+    catalog every ``full_refresh_interval`` seconds to catch anything later
+    still. Requests only ever run the incremental refresh.
+    """
+
+    def __init__(self, refresh_interval: float = 60.0, overlap: timedelta = timedelta(minutes=5),
+                 full_refresh_interval: float = 3600.0):
+        self.refresh_interval = refresh_interval
+        self.overlap = overlap
+        self.full_refresh_interval = full_refresh_interval
+        self.markets: Dict[int, MarketRecord] = {}
+        self._leaderboard_ids_by_date: Dict[date, Set[int]] = {}
+        self._high_water_mark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        # _refresh_lock serializes refreshes; _lock guards the in-memory indexes
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._reloader: Optional[threading.Thread] = None
+        self._stop_reloader = threading.Event()
+
+    @staticmethod
+    def _index(markets: Dict[int, MarketRecord], ids_by_date: Dict[date, Set[int]],
+               market_id: int, record: MarketRecord) -> None:
+        previous = markets.get(market_id)
+        if previous is not None and previous.is_leaderboard_market:
+            ids_by_date.get(previous.created_date, set()).discard(market_id)
+        markets[market_id] = record
+        if record.is_leaderboard_market:
+            ids_by_date.setdefault(record.created_date, set()).add(market_id)
+
+    @staticmethod
+    def _record(row) -> MarketRecord:
+        return MarketRecord(
+            address=row.address,
+            created_date=row.created_date,
+            deadline_date=row.deadline_date,
+            status=row.status,
+            resolution=row.resolution,
+            is_btc=bool(row.is_btc),
+        )
+
+    @staticmethod
+    def _latest(rows, high_water_mark: Optional[datetime]) -> Optional[datetime]:
+        for row in rows:
+            if row.updated_at is not None and (high_water_mark is None or row.updated_at > high_water_mark):
+                high_water_mark = row.updated_at
+        return high_water_mark
+
+    def _fetch(self, prod_engine: "Engine", since: Optional[datetime] = None) -> List:
+        from sqlalchemy import text
+
+        query = CATALOG_QUERY
+        params = {}
+        if since is not None:
+            query += "where updated_at >= :since"
+            params["since"] = since
+        with prod_engine.connect() as conn:
+            return conn.execute(text(query), params).fetchall()
+
+    def reload(self, prod_engine: "Engine") -> int:
+        """
+        Load every market into fresh indexes and swap them in at once.
+
+        Markets that were deleted or no longer qualify are dropped. Readers
+        keep using the previous catalog until the swap.
+
+        Parameters
+        ----------
+        prod_engine : Engine
+            SQLAlchemy engine for production database
+
+        Returns
+        -------
+        int
+            Number of market rows loaded
+        """
+        with self._refresh_lock:
+            rows = self._fetch(prod_engine)
+            markets: Dict[int, MarketRecord] = {}
+            ids_by_date: Dict[date, Set[int]] = {}
+            for row in rows:
+                self._index(markets, ids_by_date, int(row.market_id), self._record(row))
+            high_water_mark = self._latest(rows, None)
+
+            with self._lock:
+                self.markets = markets
+                self._leaderboard_ids_by_date = ids_by_date
+                self._high_water_mark = high_water_mark
+            self._last_refresh = time.monotonic()
+            return len(rows)
+
+    def refresh(self, prod_engine: "Engine") -> int:
+        """
+        Load markets changed since the last refresh (all markets on first use).
+
+        Parameters
+        ----------
+        prod_engine : Engine
+            SQLAlchemy engine for production database
+
+        Returns
+        -------
+        int
+            Number of market rows loaded
+        """
+        if self._high_water_mark is None:
+            return self.reload(prod_engine)
+
+        with self._refresh_lock:
+            # Re-read a window behind the mark for rows that committed late
+            rows = self._fetch(prod_engine, since=self._high_water_mark - self.overlap)
+            with self._lock:
+                for row in rows:
+                    self._index(self.markets, self._leaderboard_ids_by_date, int(row.market_id), self._record(row))
+                self._high_water_mark = self._latest(rows, self._high_water_mark)
+            self._last_refresh = time.monotonic()
+            return len(rows)
+
+    def ensure_fresh(self, prod_engine: "Engine") -> None:
+        """
+        Refresh if the catalog is empty or older than ``refresh_interval``.
+
+        Once loaded, a request never waits on another refresh or on a full
+        reload; it uses the current catalog instead.
+        """
+        if self.markets and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        if self.markets and self._refresh_lock.locked():
+            return
+        self.refresh(prod_engine)
+
+    def start_reloader(self, get_engine: Callable[[], "Engine"]) -> None:
+        """Reload the full catalog every ``full_refresh_interval`` seconds in a daemon thread."""
+        if self._reloader is not None:
+            return
+
+        def run():
+            while not self._stop_reloader.wait(self.full_refresh_interval):
+                try:
+                    self.reload(get_engine())
+                except Exception as e:
+                    print(f"Error reloading market catalog: {e}")
+
+        self._reloader = threading.Thread(target=run, name="market-catalog-reloader", daemon=True)
+        self._reloader.start()
+
+    def stop_reloader(self) -> None:
+        self._stop_reloader.set()
+
+    def leaderboard_market_ids(self, leaderboard_date: str) -> List[int]:
+        """Ids of the leaderboard's BTC markets created on the given 'YYYY-MM-DD' date."""
+        day = datetime.strptime(leaderboard_date, '%Y-%m-%d').date()
+        with self._lock:
+            return sorted(self._leaderboard_ids_by_date.get(day, ()))
+
+    def resolutions(self, market_ids: List[int]) -> Dict[int, str]:
+        """Winning outcome ('YES' or 'NO') for each known market id."""
+        with self._lock:
+            return {
+                market_id: self.markets[market_id].resolution
+                for market_id in market_ids
+                if market_id in self.markets
+            }
+
+    def addresses(self, market_ids: List[int]) -> List[Optional[str]]:
+        """Contract addresses for the given market ids, in the same order."""
+        with self._lock:
+            return [self.markets[market_id].address for market_id in market_ids]
+
+# Global market catalog instance
+market_catalog = MarketCatalog()
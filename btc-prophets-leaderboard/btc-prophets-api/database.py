@@ -1,11 +1,13 @@
 """Database connection and configuration module."""
 
 import os
-from typing import Optional
-from sqlalchemy import create_engine, Engine
-from sqlalchemy.engine import URL
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
 
+# SQLAlchemy is imported when the first engine is created, not at startup
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+
 # Load environment variables
 load_dotenv()
 
@@ -13,12 +15,14 @@ class DatabaseConfig:
     """Database configuration and connection management."""
     
     def __init__(self):
-        self.supabase_engine: Optional[Engine] = None
-        self.prod_engine: Optional[Engine] = None
+        self.supabase_engine: Optional["Engine"] = None
+        self.prod_engine: Optional["Engine"] = None
     
-    def get_supabase_engine(self) -> Engine:
+    def get_supabase_engine(self) -> "Engine":
         """Get or create Supabase database engine."""
         if self.supabase_engine is None:
+            from sqlalchemy import create_engine
+            from sqlalchemy.engine import URL
             supabase_url = URL.create(
                 drivername="postgresql",
                 username="postgres",
@@ -30,9 +34,11 @@ class DatabaseConfig:
             self.supabase_engine = create_engine(supabase_url)
         return self.supabase_engine
     
-    def get_prod_engine(self) -> Engine:
+    def get_prod_engine(self) -> "Engine":
         """Get or create production database engine."""
         if self.prod_engine is None:
+            from sqlalchemy import create_engine
+            from sqlalchemy.engine import URL
             prod_url = URL.create(
                 drivername="postgresql",
                 username="postgres",
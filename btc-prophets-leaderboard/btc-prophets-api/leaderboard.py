@@ -1,79 +1,100 @@
 """Leaderboard data calculation module."""
 
-import pandas as pd
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
-from typing import List, Dict, Any
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
-def get_roi_df(leaderboard_date: str, prod_engine: Engine) -> pd.DataFrame:
-    """
-    Calculate ROI data for Bitcoin-related markets on the given date.
-    
-    Parameters
-    ----------
-    leaderboard_date : str
-        Date in 'YYYY-MM-DD' format
-    prod_engine : Engine
-        SQLAlchemy engine for production database
-        
-    Returns
-    -------
-    pd.DataFrame
-        DataFrame with wallet_address, display_name, total_buy_volume_usd,
-        total_profit_usd, and roi columns
-    """
-    roi_query = text(f"""
-    WITH 
-    btc_markets as (
-    select id as market_id, title
-    from public.markets 
-    where status = 'RESOLVED'
-        and created_at::date = '{leaderboard_date}'::date
-        and ((deadline)::date - (created_at)::date) <= 1
-        and (lower(title) LIKE '%btc%' or lower(description) LIKE '%bitcoin%')
-    ),
-    resolutions AS (
-    SELECT
-        id as market_id,
-        title,
-        status,
-        CASE WHEN winning_index = 1 THEN 'NO' ELSE 'YES' END as resolution
-    FROM public.markets
-    ),
-    user_trades_amm AS (
-        SELECT 
-            TO_TIMESTAMP(t.block_timestamp) as tx_date,
-            t.account as wallet_address,
-            m.id as market_id,
-            t.strategy as side,
-            t.outcome,
-            t.token_usd_rate,
-            CASE WHEN strategy = 'BUY' THEN trade_amount_usd ELSE 0 END as buy_amount_usd,
-            CASE 
-                WHEN strategy = 'BUY' THEN -trade_amount_usd
-                WHEN strategy = 'SELL' THEN trade_amount_usd
-            END as cash_flow_usd,
-            CASE 
-                WHEN strategy = 'BUY' THEN contracts
-                WHEN strategy = 'SELL' THEN -contracts
-            END as positions
-        FROM analytic.market_trades t 
-        left join public.markets m 
+# pandas and SQLAlchemy are imported on first computation, not when the API starts
+if TYPE_CHECKING:
+    import pandas as pd
+    from sqlalchemy.engine import Engine
+
+from catalog import MarketCatalog, market_catalog
+from profiles import ProfileCache, profile_cache
+
+# Explicit column types for the ROI result; numeric columns are parsed straight
+# into float64 instead of going through Decimal objects
+ROI_DTYPES = {
+    "wallet_address": object,
+    "display_name": object,
+    "total_buy_volume_usd": "float64",
+    "total_profit_usd": "float64",
+    "roi": "float64",
+}
+
+LEG_DTYPES = {
+    "market_id": "int64",
+    "outcome": object,
+    "trade_profit_usd": "float64",
+    "net_position": "float64",
+    "position_usd_value": "float64",
+    "total_buy_usd": "float64",
+}
+
+AMM_LEG_DTYPES = dict({"wallet_address": object}, **LEG_DTYPES)
+
+CLOB_LEG_DTYPES = dict({"profile_id": "Int64"}, **LEG_DTYPES)
+
+ROI_COLUMNS = list(ROI_DTYPES)
+
+# SQLSTATE for a statement cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+class LeaderboardTimeout(Exception):
+    """Raised when a leaderboard query exceeds its statement timeout."""
+
+# Per-(owner, market, outcome) partial aggregates of one leg. Each leg selects
+# its owner column (wallet_address for AMM, profile_id for CLOB), market_id,
+# side, outcome, token_usd_rate, amount_usd and contracts; the partials of all
+# legs are summed in-process.
+LEG_AGGREGATE = """
+SELECT
+    {owner},
+    market_id,
+    outcome,
+    SUM(CASE 
+        WHEN side = 'BUY' THEN -amount_usd
+        WHEN side = 'SELL' THEN amount_usd
+    END) as trade_profit_usd,
+    SUM(CASE 
+        WHEN side = 'BUY' THEN contracts
+        WHEN side = 'SELL' THEN -contracts
+    END) as net_position,
+    SUM(CASE 
+        WHEN side = 'BUY' THEN contracts
+        WHEN side = 'SELL' THEN -contracts
+    END * token_usd_rate) as position_usd_value,
+    SUM(CASE WHEN side = 'BUY' THEN amount_usd ELSE 0 END) as total_buy_usd
+FROM ({leg}) leg
+GROUP BY 1, 2, 3
+"""
+
+AMM_LEG_QUERY = LEG_AGGREGATE.format(owner="wallet_address", leg="""
+    SELECT 
+        t.account as wallet_address,
+        m.id as market_id,
+        t.strategy as side,
+        t.outcome,
+        t.token_usd_rate,
+        t.trade_amount_usd as amount_usd,
+        t.contracts
+    FROM analytic.market_trades t 
+    join unnest(%(market_ids)s::int[], %(market_addresses)s::text[]) as m(id, address)
         on t.market_address = m.address
-        where m.id in (select market_id from btc_markets)
-    ),
-    clob_raw_taker as (
+""")
+
+CLOB_TAKER_LEG_QUERY = LEG_AGGREGATE.format(owner="profile_id", leg="""
     SELECT
-        t.created_at,
         t.id_taker_owner as profile_id,
         t.id_market::int as market_id,
         o.side,
         case when o.token = c.main_token then 'YES'
             when o.token = c.complementary_token then 'NO'
             else null end as outcome,
-        t.matched_size / POWER(10, 6) as matched_size_contracts,
+        1 as token_usd_rate,
         case when o.type = 'GTC' then t.matched_size / POWER(10, 6) * o.price
-            else t.filled_amount / POWER(10, 6) end as matched_size_usd
+            else t.filled_amount / POWER(10, 6) end as amount_usd,
+        t.matched_size / POWER(10, 6) as contracts
     FROM ome.trade_events t
     left join public.trade_events pt
         on t.id_taker_order = pt.taker_order_id
@@ -82,20 +103,21 @@ def get_roi_df(leaderboard_date: str, prod_engine: Engine) -> pd.DataFrame:
     left join ome.market_configs c
         on o.id_market = c.id_market
     where pt.status = 'MINED'
-        and t.id_market::int in (select market_id from btc_markets)
-    ),
-    clob_raw_maker as (
+        and t.id_market::int = ANY(%(market_ids)s)
+""")
+
+CLOB_MAKER_LEG_QUERY = LEG_AGGREGATE.format(owner="profile_id", leg="""
     SELECT
-        te.created_at,
         t.id_maker_owner as profile_id,
         o.id_market::int as market_id,
         o.side,
         case when o.token = c.main_token then 'YES'
             when o.token = c.complementary_token then 'NO'
             else null end as outcome,
-        t.matched_size / POWER(10, 6) as matched_size_contracts,
+        1 as token_usd_rate,
         case when o.type = 'GTC' then t.matched_size / POWER(10, 6) * o.price
-            else t.filled_amount / POWER(10, 6) end as matched_size_usd
+            else t.filled_amount / POWER(10, 6) end as amount_usd,
+        t.matched_size / POWER(10, 6) as contracts
     FROM ome.trade_events_maker t
     left join public.maker_matches mm
         on t.id_maker_order = mm.order_id
@@ -106,95 +128,208 @@ def get_roi_df(leaderboard_date: str, prod_engine: Engine) -> pd.DataFrame:
     left join ome.market_configs c
         on o.id_market = c.id_market
     where te.status = 'MINED'
-        and o.id_market::int in (select market_id from btc_markets)
-    ),
-    user_trades_clob AS (
-    SELECT
-        clob_all.created_at as tx_date,
-        p.account as wallet_address,
-        market_id::int,
-        side,
-        outcome,
-        1 as token_usd_rate,
-        CASE WHEN side = 'BUY' THEN matched_size_usd ELSE 0 END as buy_amount_usd, 
-        CASE 
-            WHEN side = 'BUY' THEN -matched_size_usd
-            WHEN side = 'SELL' THEN matched_size_usd
-        END as cash_flow_usd,
-        CASE 
-            WHEN side = 'BUY' THEN matched_size_contracts
-            WHEN side = 'SELL' THEN -matched_size_contracts
-        END as positions
-    FROM (
-        select *, 'taker' as clob_side from clob_raw_taker
-        UNION ALL
-        select *, 'maker' as clob_side from clob_raw_maker
-        ) clob_all
-    left join public.profiles p 
-        on p.id = clob_all.profile_id
-    ),
-    user_trades as (
-    select * from user_trades_amm
-    UNION ALL 
-    select * from user_trades_clob
-    ),
-    outcomes as (
-    SELECT
-        wallet_address,
-        market_id,
-        outcome,
-        SUM(cash_flow_usd) as trade_profit_usd,
-        SUM(positions) as net_position,
-        CASE 
-            WHEN SUM(positions) = 0 THEN 0
-            ELSE SUM(positions * token_usd_rate) / NULLIF(SUM(positions), 0)
-        END as weighted_positions_usd_rate,
-
-        SUM(buy_amount_usd) as total_buy_usd
-    FROM user_trades
-    GROUP BY 1,2,3
-    ),
-    profits as (
-    select 
-        o.*, 
-        r.resolution,
-        CASE 
-        WHEN resolution = outcome THEN net_position * weighted_positions_usd_rate
-        WHEN resolution != outcome THEN 0
-        END as resolution_profit_usd
-    from outcomes o 
-    left join resolutions r 
-        on o.market_id = r.market_id
-    ),
-    final as (
-    SELECT 
-    p.wallet_address,
-    display_name,
-    SUM(trade_profit_usd) as trade_profit_usd,
-    SUM(resolution_profit_usd) as resolution_profit_usd,
-    SUM(trade_profit_usd + resolution_profit_usd) as total_profit_usd,
-
-    SUM(total_buy_usd) as total_buy_volume_usd
-    FROM profits p 
-    left join public.profiles u
-    on p.wallet_address = u.account
-    group by 1, 2
+        and o.id_market::int = ANY(%(market_ids)s)
+""")
+
+LEG_QUERIES = {
+    "amm": (AMM_LEG_QUERY, AMM_LEG_DTYPES),
+    "clob_taker": (CLOB_TAKER_LEG_QUERY, CLOB_LEG_DTYPES),
+    "clob_maker": (CLOB_MAKER_LEG_QUERY, CLOB_LEG_DTYPES),
+}
+
+def read_sql_copy(
+    query: str,
+    engine: "Engine",
+    params: Optional[Dict[str, Any]] = None,
+    dtypes: Optional[Dict[str, Any]] = None,
+    statement_timeout_ms: Optional[int] = None,
+) -> "pd.DataFrame":
+    """
+    Fetch a query result through ``COPY (query) TO STDOUT``.
+
+    The server streams the result as CSV into a byte buffer, which the pandas C
+    parser converts directly into typed columns. This avoids materializing
+    every row as a tuple of Python objects (``Decimal`` for numerics) the way
+    ``pd.read_sql`` does, which dominates time and memory on large results.
+
+    Parameters
+    ----------
+    query : str
+        SELECT statement using psycopg2 ``%(name)s`` placeholders
+    engine : Engine
+        SQLAlchemy engine backed by psycopg2
+    params : Optional[Dict[str, Any]]
+        Query parameters, bound client-side since COPY does not accept them
+    dtypes : Optional[Dict[str, Any]]
+        Column dtypes passed to ``pd.read_csv``; text columns should be
+        ``object`` so NULLs come back as None
+    statement_timeout_ms : Optional[int]
+        Server-side ``statement_timeout`` for this query only
+
+    Returns
+    -------
+    pd.DataFrame
+        Query result with the requested dtypes
+    """
+    import pandas as pd
+
+    buffer = io.BytesIO()
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cursor:
+            if statement_timeout_ms:
+                cursor.execute("SET LOCAL statement_timeout = %s", (int(statement_timeout_ms),))
+            bound_query = cursor.mogrify(query, params).decode("utf-8")
+            cursor.copy_expert(
+                f"COPY ({bound_query}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '\\N')",
+                buffer,
+            )
+        raw_conn.commit()
+    except Exception as e:
+        raw_conn.rollback()
+        if getattr(e, "pgcode", None) == QUERY_CANCELED:
+            raise LeaderboardTimeout(f"Query exceeded statement timeout of {statement_timeout_ms} ms") from e
+        raise
+    finally:
+        raw_conn.close()
+
+    buffer.seek(0)
+    df = pd.read_csv(buffer, dtype=dtypes, na_values=["\\N"], keep_default_na=False)
+
+    # NULL text values should surface as None, matching pd.read_sql
+    for column, dtype in (dtypes or {}).items():
+        if dtype is object and column in df:
+            df[column] = df[column].where(df[column].notna(), None)
+    return df
+
+def merge_leg_partials(partials: List["pd.DataFrame"], resolutions: Dict[int, str]) -> "pd.DataFrame":
+    """
+    Merge per-leg partial aggregates into per-wallet totals.
+
+    Parameters
+    ----------
+    partials : List[pd.DataFrame]
+        Leg results with ``LEG_DTYPES`` columns
+    resolutions : Dict[int, str]
+        Winning outcome ('YES' or 'NO') by market id
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per wallet with total_buy_volume_usd and total_profit_usd
+    """
+    import pandas as pd
+
+    keys = ["wallet_address", "market_id", "outcome"]
+    outcomes = (
+        pd.concat(partials, ignore_index=True)
+        .groupby(keys, dropna=False, sort=False)
+        .sum()
+        .reset_index()
     )
 
-    select 
-    wallet_address,
-    display_name,
-    total_buy_volume_usd,
-    total_profit_usd,
-    total_profit_usd / total_buy_volume_usd as roi
-    from final
-    order by 5 desc
-    """)
+    # Positions on the winning outcome redeem at their weighted USD rate;
+    # unknown markets or outcomes give no resolution profit (NULL in SQL)
+    resolution = outcomes["market_id"].map(resolutions)
+    wins = outcomes["net_position"].ne(0) & resolution.eq(outcomes["outcome"])
+    resolution_profit = outcomes["position_usd_value"].where(wins, 0.0)
+    resolution_profit = resolution_profit.where(resolution.notna() & outcomes["outcome"].notna())
+    outcomes["total_profit_usd"] = outcomes["trade_profit_usd"] + resolution_profit
 
-    roi_df = pd.read_sql(roi_query, prod_engine)
-    return roi_df
+    return (
+        outcomes.groupby("wallet_address", sort=False)
+        .agg(
+            total_buy_volume_usd=("total_buy_usd", "sum"),
+            total_profit_usd=("total_profit_usd", "sum"),
+        )
+        .reset_index()
+    )
 
-def get_leaderboard_data(date: str, prod_engine: Engine) -> List[Dict[str, Any]]:
+def get_roi_df(
+    leaderboard_date: str,
+    prod_engine: "Engine",
+    catalog: Optional[MarketCatalog] = None,
+    profiles: Optional[ProfileCache] = None,
+    statement_timeout_ms: Optional[int] = None,
+) -> "pd.DataFrame":
+    """
+    Calculate ROI data for Bitcoin-related markets on the given date.
+
+    The AMM, CLOB taker and CLOB maker trades are aggregated by separate
+    queries running concurrently on pooled connections, so the wall-clock
+    time is roughly that of the slowest leg. Their partial aggregates are
+    merged in-process. Market selection and resolutions come from the
+    in-memory market catalog rather than from the markets table, and wallet
+    accounts and display names from the profile cache.
+    
+    Parameters
+    ----------
+    leaderboard_date : str
+        Date in 'YYYY-MM-DD' format
+    prod_engine : Engine
+        SQLAlchemy engine for production database
+    catalog : Optional[MarketCatalog]
+        Market catalog to use (defaults to the process-wide catalog)
+    profiles : Optional[ProfileCache]
+        Profile cache to use (defaults to the process-wide cache)
+    statement_timeout_ms : Optional[int]
+        Per-query ``statement_timeout`` for the leg queries
+        
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with wallet_address, display_name, total_buy_volume_usd,
+        total_profit_usd, and roi columns
+    """
+    import pandas as pd
+
+    catalog = catalog or market_catalog
+    profiles = profiles or profile_cache
+    catalog.ensure_fresh(prod_engine)
+
+    market_ids = catalog.leaderboard_market_ids(leaderboard_date)
+    if not market_ids:
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in ROI_DTYPES.items()})
+
+    params = {"market_ids": market_ids, "market_addresses": catalog.addresses(market_ids)}
+    with ThreadPoolExecutor(max_workers=len(LEG_QUERIES)) as executor:
+        futures = [
+            executor.submit(read_sql_copy, query, prod_engine, params, dtypes, statement_timeout_ms)
+            for query, dtypes in LEG_QUERIES.values()
+        ]
+        profiles.ensure_fresh(prod_engine)
+        partials = [future.result() for future in futures]
+
+    # CLOB legs are keyed by profile id; map them to wallet accounts
+    for i, partial in enumerate(partials):
+        if "profile_id" in partial:
+            accounts = profiles.accounts(prod_engine, partial["profile_id"].dropna().unique())
+            wallets = partial["profile_id"].map(accounts, na_action="ignore").astype(object)
+            partials[i] = partial.drop(columns="profile_id").assign(
+                wallet_address=wallets.where(wallets.notna(), None)
+            )
+
+    totals = merge_leg_partials(partials, catalog.resolutions(market_ids))
+
+    # Trades without a known wallet cannot be shown on the board
+    totals = totals[totals["wallet_address"].notna()]
+    # ROI is undefined for wallets that only sold
+    totals = totals[totals["total_buy_volume_usd"] != 0]
+    if totals.empty:
+        return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in ROI_DTYPES.items()})
+
+    display_names = profiles.display_names(prod_engine, totals["wallet_address"])
+    roi_df = totals.assign(
+        display_name=[display_names.get(wallet) for wallet in totals["wallet_address"]],
+        roi=totals["total_profit_usd"] / totals["total_buy_volume_usd"],
+    )
+    return roi_df[ROI_COLUMNS].sort_values("roi", ascending=False, ignore_index=True)
+
+def get_leaderboard_data(
+    date: str,
+    prod_engine: "Engine",
+    statement_timeout_ms: Optional[int] = None,
+) -> List[Dict[str, Any]]:
     """
     Get formatted leaderboard data for the API.
     
@@ -204,18 +339,20 @@ def get_leaderboard_data(date: str, prod_engine: Engine) -> List[Dict[str, Any]]
         Date in 'YYYY-MM-DD' format
     prod_engine : Engine
         SQLAlchemy engine for production database
+    statement_timeout_ms : Optional[int]
+        Per-query ``statement_timeout``; exceeding it raises LeaderboardTimeout
         
     Returns
     -------
     List[Dict[str, Any]]
         List of leaderboard entries formatted for API response
+
+    Raises
+    ------
+    LeaderboardTimeout
+        If a query was cancelled by the statement timeout
     """
-    try:
-        df = get_roi_df(date, prod_engine)
-        
-        # Convert DataFrame to list of dictionaries
-        return df.to_dict('records')
+    df = get_roi_df(date, prod_engine, statement_timeout_ms=statement_timeout_ms)
     
-    except Exception as e:
-        print(f"Error fetching leaderboard data: {e}")
-        return []
\ No newline at end of file
+    # Convert DataFrame to list of dictionaries
+    return df.to_dict('records')
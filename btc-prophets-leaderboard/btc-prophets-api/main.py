@@ -1,15 +1,32 @@
 """FastAPI server for BTC Prophets leaderboard."""
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy import text
+import time
+import argparse
+import os
+import threading
 import uvicorn
 
 from database import db_config
-from leaderboard import get_leaderboard_data
+from catalog import market_catalog
+from profiles import profile_cache
+from leaderboard import get_leaderboard_data, LeaderboardTimeout
+from result_cache import ETAG_SUFFIXES, CachedResult, result_cache
+from admission import AdmissionRejected, MAX_CONCURRENT_TOTAL, leaderboard_admission
+
+# Server-side deadline for each leaderboard query
+STATEMENT_TIMEOUT_MS = int(os.getenv("LEADERBOARD_STATEMENT_TIMEOUT_MS", "15000"))
+
+# How heavy state (pandas, database engine, market catalog, profile cache) is loaded:
+#   eager      - during startup, before the first request is accepted
+#   background - in a thread after startup, so / and /api/health answer at once
+#   lazy       - on the first leaderboard request
+WARMUP_MODE = os.getenv("LEADERBOARD_WARMUP", "background")
 
 app = FastAPI(
     title="BTC Prophets Leaderboard API",
@@ -33,6 +50,87 @@ class LeaderboardEntry(BaseModel):
     total_profit_usd: float
     roi: float
 
+# Boards are serialized once, when computed, and served from the cache as bytes
+leaderboard_adapter = TypeAdapter(List[LeaderboardEntry])
+
+# Preferred content codings, best compression first
+SERVED_ENCODINGS = ("br", "gzip")
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Content codings the client accepts, from an Accept-Encoding header."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def _etag_matches(if_none_match: str, cached: CachedResult) -> bool:
+    """
+    Weak comparison of an If-None-Match header against the board's ETags.
+
+    The tag of any encoding matches: all encodings carry the same content,
+    so a client revalidating its gzip copy may be sent a 304 for brotli.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    etags = {cached.etag_for(encoding) for encoding in ETAG_SUFFIXES}
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") in etags for tag in candidates)
+
+def _cached_response(request: Request, cached: CachedResult, cache_status: str) -> Response:
+    """
+    Serve a cached board: 304 if the client's copy is current, else the
+    precompressed body in the best encoding the client accepts.
+    """
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = next(
+        (
+            encoding for encoding in SERVED_ENCODINGS
+            if cached.encoded(encoding) is not None and (encoding in accepted or "*" in accepted)
+        ),
+        "identity",
+    )
+
+    max_age = max(0, int(cached.expires_at - time.time()))
+    headers = {
+        "ETag": cached.etag_for(encoding),
+        "Vary": "Accept-Encoding",
+        "Cache-Control": f"public, max-age={max_age}",
+        "X-Cache": cache_status,
+    }
+    if cache_status == "STALE":
+        headers["Warning"] = '110 - "Response is Stale"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, cached):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=cached.encoded(encoding), media_type="application/json", headers=headers)
+
+def _compute_and_store(date: str) -> Optional[CachedResult]:
+    """
+    Compute a board, then validate, serialize, compress and cache it.
+
+    Runs in a worker thread: serialization, compression and the SQLite write
+    are CPU and lock bound and must not block the event loop.
+    """
+    data = get_leaderboard_data(date, db_config.get_prod_engine(), STATEMENT_TIMEOUT_MS)
+    if not data:
+        return None
+    rows = leaderboard_adapter.validate_python(data)
+    return result_cache.put(date, leaderboard_adapter.dump_json(rows))
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -40,10 +138,21 @@ async def root():
 
 @app.get("/api/leaderboard", response_model=List[LeaderboardEntry])
 async def get_leaderboard(
+    request: Request,
     date: str = Query(..., description="Date in YYYY-MM-DD format", regex=r"^\d{4}-\d{2}-\d{2}$")
 ):
     """
     Get leaderboard data for a specific date.
+
+    Results are served from the cache shared by all worker processes while
+    fresh; otherwise the board is computed and stored there. Computations
+    pass through admission control: when the service is saturated or a query
+    hits its statement timeout, a stale cached board is served if there is
+    one, else 503 with Retry-After.
+
+    Cached boards are stored serialized and precompressed (gzip, plus brotli
+    when available) with a content-hash ETag. The body is sent in the best
+    encoding named in Accept-Encoding, and a matching If-None-Match gets 304.
     
     Parameters
     ----------
@@ -61,14 +170,32 @@ async def get_leaderboard(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD.")
     
+    # SQLite may wait on another worker's write lock; keep that off the event loop
+    cached = await run_in_threadpool(result_cache.get, date)
+    if cached is not None and cached.is_fresh:
+        return _cached_response(request, cached, "HIT")
+    
     try:
-        prod_engine = db_config.get_prod_engine()
-        data = get_leaderboard_data(date, prod_engine)
+        async with leaderboard_admission.admit():
+            stored = await run_in_threadpool(_compute_and_store, date)
         
-        if not data:
+        if stored is None:
             raise HTTPException(status_code=404, detail=f"No leaderboard data found for date {date}")
         
-        return data
+        return _cached_response(request, stored, "MISS")
+    
+    except (AdmissionRejected, LeaderboardTimeout) as e:
+        if cached is not None:
+            return _cached_response(request, cached, "STALE")
+        retry_after = e.retry_after if isinstance(e, AdmissionRejected) else leaderboard_admission.retry_after
+        raise HTTPException(
+            status_code=503,
+            detail=f"Leaderboard service is busy: {str(e)}",
+            headers={"Retry-After": str(retry_after)},
+        )
+    
+    except HTTPException:
+        raise
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching leaderboard data: {str(e)}")
@@ -77,6 +204,8 @@ async def get_leaderboard(
 async def health_check():
     """Extended health check with database connectivity."""
     try:
+        from sqlalchemy import text
+
         # Test database connections
         prod_engine = db_config.get_prod_engine()
         with prod_engine.connect() as conn:
@@ -85,6 +214,8 @@ async def health_check():
         return {
             "status": "healthy",
             "database": "connected",
+            "leaderboard_active": leaderboard_admission.active,
+            "leaderboard_waiting": leaderboard_admission.waiting,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -95,16 +226,67 @@ async def health_check():
             "timestamp": datetime.now().isoformat()
         }
 
+def warm_up():
+    """Import pandas and load the market catalog and profile cache."""
+    try:
+        import pandas  # noqa: F401
+        prod_engine = db_config.get_prod_engine()
+        market_catalog.refresh(prod_engine)
+        profile_cache.refresh(prod_engine)
+    except Exception as e:
+        # Whatever failed to load is loaded on the first leaderboard request instead
+        print(f"Error warming caches: {e}")
+
+@app.on_event("startup")
+async def startup_event():
+    """Warm up leaderboard state according to LEADERBOARD_WARMUP and start periodic reloads."""
+    # Full reloads run off the request path; requests only refresh incrementally
+    market_catalog.start_reloader(db_config.get_prod_engine)
+    profile_cache.start_rebuilder(db_config.get_prod_engine)
+    if WARMUP_MODE == "eager":
+        await run_in_threadpool(warm_up)
+    elif WARMUP_MODE == "background":
+        threading.Thread(target=warm_up, name="leaderboard-warmup", daemon=True).start()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up database connections on shutdown."""
+    market_catalog.stop_reloader()
+    profile_cache.stop_rebuilder()
     db_config.close_connections()
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the BTC Prophets Leaderboard API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--prod", action="store_true",
+                        help="Production mode: multiple workers, no auto-reload")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes in production mode (default: WEB_CONCURRENCY, "
+                             "else CPU count capped at LEADERBOARD_MAX_CONCURRENT)")
+    args = parser.parse_args()
+
+    if args.prod:
+        workers = args.workers or int(os.getenv(
+            "WEB_CONCURRENCY", min(os.cpu_count() or 1, MAX_CONCURRENT_TOTAL)
+        ))
+        if workers > MAX_CONCURRENT_TOTAL:
+            print(f"Warning: {workers} workers exceed LEADERBOARD_MAX_CONCURRENT={MAX_CONCURRENT_TOTAL}; "
+                  f"up to {workers} leaderboard computations may run at once")
+        # Workers read this to take their share of the global admission budget
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        uvicorn.run(
+            "main:app",
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+            log_level="info"
+        )
\ No newline at end of file
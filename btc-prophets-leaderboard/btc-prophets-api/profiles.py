@@ -0,0 +1,266 @@
+"""Bounded in-process cache of wallet profiles."""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+PROFILES_QUERY = """
+select id, account, display_name, updated_at
+from public.profiles
+"""
+
+class ProfileCache:
+    """
+    Profile id <-> account <-> display name lookups kept out of the hot query.
+
+    The most recently updated profiles are bulk-loaded on first use, changes
+    are pulled incrementally from ``updated_at`` every ``ttl`` seconds, and
+    profiles missing from the cache are fetched in one batch on demand. The
+    cache holds at most ``max_size`` profiles, evicting the least recently
+    used.
+
+    As in the market catalog, incremental refreshes re-read an ``overlap``
+    window behind the high-water mark for rows that committed late, and a
+    background thread rebuilds the cache every ``full_refresh_interval``
+    seconds. Requests only ever run the incremental refresh.
+    """
+
+    def __init__(self, max_size: int = 500_000, ttl: float = 300.0,
+                 overlap: timedelta = timedelta(minutes=5), full_refresh_interval: float = 6 * 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.overlap = overlap
+        self.full_refresh_interval = full_refresh_interval
+        # id -> (account, display_name); (None, None) records a known miss
+        self._by_id: "OrderedDict[int, Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+        self._id_by_account: Dict[str, int] = {}
+        # Accounts looked up without a profile, so they are not refetched each request
+        self._unknown_accounts: "OrderedDict[str, None]" = OrderedDict()
+        self._high_water_mark: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._rebuilder: Optional[threading.Thread] = None
+        self._stop_rebuilder = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _put(self, profile_id: int, account: Optional[str], display_name: Optional[str]) -> None:
+        previous = self._by_id.pop(profile_id, None)
+        if previous is not None and previous[0] and self._id_by_account.get(previous[0]) == profile_id:
+            del self._id_by_account[previous[0]]
+
+        self._by_id[profile_id] = (account, display_name)
+        if account:
+            self._id_by_account[account] = profile_id
+            self._unknown_accounts.pop(account, None)
+
+        while len(self._by_id) > self.max_size:
+            evicted_id, (evicted_account, _) = self._by_id.popitem(last=False)
+            if evicted_account and self._id_by_account.get(evicted_account) == evicted_id:
+                del self._id_by_account[evicted_account]
+
+    def _store(self, rows: Iterable, advance: bool = True) -> None:
+        with self._lock:
+            for row in rows:
+                self._put(int(row.id), row.account, row.display_name)
+                if advance and row.updated_at is not None and (
+                    self._high_water_mark is None or row.updated_at > self._high_water_mark
+                ):
+                    self._high_water_mark = row.updated_at
+
+    def rebuild(self, prod_engine: "Engine") -> int:
+        """
+        Bulk-load the most recently updated profiles into a fresh cache and swap it in.
+
+        The new cache is filled off-lock and replaces the old one in a single
+        step, so concurrent lookups see either the old or the new cache, never
+        a partially filled one.
+
+        Parameters
+        ----------
+        prod_engine : Engine
+            SQLAlchemy engine for production database
+
+        Returns
+        -------
+        int
+            Number of profile rows loaded
+        """
+        from sqlalchemy import text
+
+        with self._refresh_lock:
+            with prod_engine.connect() as conn:
+                rows = conn.execute(
+                    text(PROFILES_QUERY + "order by updated_at desc nulls last limit :limit"),
+                    {"limit": self.max_size},
+                ).fetchall()
+            fresh = ProfileCache(self.max_size)
+            # Oldest first, so the most recently updated profiles are the last evicted
+            fresh._store(reversed(rows))
+
+            with self._lock:
+                self._by_id = fresh._by_id
+                self._id_by_account = fresh._id_by_account
+                self._unknown_accounts = fresh._unknown_accounts
+                self._high_water_mark = fresh._high_water_mark
+            self._last_refresh = time.monotonic()
+            return len(rows)
+
+    def refresh(self, prod_engine: "Engine") -> int:
+        """
+        Load profiles changed since the last refresh (bulk-load on first use).
+
+        Parameters
+        ----------
+        prod_engine : Engine
+            SQLAlchemy engine for production database
+
+        Returns
+        -------
+        int
+            Number of profile rows loaded
+        """
+        from sqlalchemy import text
+
+        if self._high_water_mark is None:
+            return self.rebuild(prod_engine)
+
+        with self._refresh_lock:
+            # Re-read a window behind the mark for rows that committed late
+            with prod_engine.connect() as conn:
+                rows = conn.execute(
+                    text(PROFILES_QUERY + "where updated_at >= :since"),
+                    {"since": self._high_water_mark - self.overlap},
+                ).fetchall()
+            self._store(reversed(rows))
+
+            self._last_refresh = time.monotonic()
+            return len(rows)
+
+    def ensure_fresh(self, prod_engine: "Engine") -> None:
+        """Refresh if the cache was never loaded or is older than ``ttl``."""
+        if self._last_refresh and time.monotonic() - self._last_refresh < self.ttl:
+            return
+        if self._last_refresh and self._refresh_lock.locked():
+            return
+        self.refresh(prod_engine)
+
+    def start_rebuilder(self, get_engine: Callable[[], "Engine"]) -> None:
+        """Rebuild the cache every ``full_refresh_interval`` seconds in a daemon thread."""
+        if self._rebuilder is not None:
+            return
+
+        def run():
+            while not self._stop_rebuilder.wait(self.full_refresh_interval):
+                try:
+                    self.rebuild(get_engine())
+                except Exception as e:
+                    print(f"Error rebuilding profile cache: {e}")
+
+        self._rebuilder = threading.Thread(target=run, name="profile-cache-rebuilder", daemon=True)
+        self._rebuilder.start()
+
+    def stop_rebuilder(self) -> None:
+        self._stop_rebuilder.set()
+
+    def _load_missing(self, prod_engine: "Engine", column: str, values: List) -> List:
+        from sqlalchemy import text
+
+        with prod_engine.connect() as conn:
+            rows = conn.execute(
+                text(PROFILES_QUERY + f"where {column} = ANY(:values)"), {"values": values}
+            ).fetchall()
+        # On-demand loads must not move the incremental refresh high-water mark
+        self._store(rows, advance=False)
+        return rows
+
+    def accounts(self, prod_engine: "Engine", profile_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+        """
+        Map profile ids to wallet accounts.
+
+        Parameters
+        ----------
+        prod_engine : Engine
+            SQLAlchemy engine used to fetch profiles missing from the cache
+        profile_ids : Iterable[int]
+            Profile ids to resolve
+
+        Returns
+        -------
+        Dict[int, Optional[str]]
+            Account for each id (None for unknown profiles)
+        """
+        result = {}
+        missing = []
+        with self._lock:
+            for profile_id in {int(profile_id) for profile_id in profile_ids}:
+                entry = self._by_id.get(profile_id)
+                if entry is None:
+                    missing.append(profile_id)
+                else:
+                    self._by_id.move_to_end(profile_id)
+                    result[profile_id] = entry[0]
+
+        if missing:
+            # Answer misses from the fetched rows, not the cache, which a
+            # concurrent rebuild may have swapped out in the meantime
+            loaded = {int(row.id): row.account for row in self._load_missing(prod_engine, "id", missing)}
+            with self._lock:
+                for profile_id in missing:
+                    if profile_id not in loaded:
+                        self._put(profile_id, None, None)
+            for profile_id in missing:
+                result[profile_id] = loaded.get(profile_id)
+        return result
+
+    def display_names(self, prod_engine: "Engine", accounts: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Map wallet accounts to display names.
+
+        Parameters
+        ----------
+        prod_engine : Engine
+            SQLAlchemy engine used to fetch profiles missing from the cache
+        accounts : Iterable[str]
+            Wallet accounts to resolve
+
+        Returns
+        -------
+        Dict[str, Optional[str]]
+            Display name for each account (None if unknown or unset)
+        """
+        result = {}
+        missing = []
+        with self._lock:
+            for account in set(accounts):
+                profile_id = self._id_by_account.get(account)
+                entry = self._by_id.get(profile_id) if profile_id is not None else None
+                if entry is not None:
+                    self._by_id.move_to_end(profile_id)
+                    result[account] = entry[1]
+                elif account in self._unknown_accounts:
+                    result[account] = None
+                else:
+                    missing.append(account)
+
+        if missing:
+            loaded = {row.account: row.display_name for row in self._load_missing(prod_engine, "account", missing)}
+            with self._lock:
+                for account in missing:
+                    if account not in loaded:
+                        self._unknown_accounts[account] = None
+                while len(self._unknown_accounts) > self.max_size:
+                    self._unknown_accounts.popitem(last=False)
+            for account in missing:
+                result[account] = loaded.get(account)
+        return result
+
+# Global profile cache instance
+profile_cache = ProfileCache()
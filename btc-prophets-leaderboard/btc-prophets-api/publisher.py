@@ -0,0 +1,134 @@
+"""Publish computed leaderboards to the Supabase leaderboard table."""
+
+import argparse
+import io
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from database import db_config
+from leaderboard import get_roi_df
+
+LEADERBOARD_TABLE = "public.btc_prophets_leaderboard"
+
+LEADERBOARD_COLUMNS = [
+    "leaderboard_date",
+    "rank",
+    "wallet_address",
+    "display_name",
+    "total_buy_volume_usd",
+    "total_profit_usd",
+    "roi",
+]
+
+CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {LEADERBOARD_TABLE} (
+    leaderboard_date date NOT NULL,
+    rank integer NOT NULL,
+    wallet_address text NOT NULL,
+    display_name text,
+    total_buy_volume_usd double precision NOT NULL,
+    total_profit_usd double precision NOT NULL,
+    roi double precision,
+    published_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (leaderboard_date, wallet_address)
+)
+"""
+
+_table_ready = False
+
+def _leaderboard_csv(leaderboard_date: str, roi_df: pd.DataFrame) -> Tuple[io.StringIO, int]:
+    """Serialize leaderboard rows as headerless CSV in table column order."""
+    rows = roi_df[roi_df["wallet_address"].notna()].reset_index(drop=True)
+    rows = rows.assign(leaderboard_date=leaderboard_date, rank=rows.index + 1)
+    buffer = io.StringIO()
+    # Empty unquoted fields load as NULL under COPY ... (FORMAT csv)
+    rows[LEADERBOARD_COLUMNS].to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    return buffer, len(rows)
+
+def publish_leaderboard(leaderboard_date: str, roi_df: pd.DataFrame, supabase_engine: Engine) -> int:
+    """
+    Replace the published leaderboard for a date with the given rows.
+
+    The date's existing rows are deleted and the new rows are streamed in
+    with ``COPY FROM STDIN`` inside a single transaction, so publishing is
+    idempotent per date and readers never see a partially written board.
+
+    Parameters
+    ----------
+    leaderboard_date : str
+        Date in 'YYYY-MM-DD' format
+    roi_df : pd.DataFrame
+        Result of ``get_roi_df`` for that date, ordered by ROI descending
+    supabase_engine : Engine
+        SQLAlchemy engine for the Supabase database
+
+    Returns
+    -------
+    int
+        Number of rows published
+    """
+    global _table_ready
+
+    buffer, row_count = _leaderboard_csv(leaderboard_date, roi_df)
+    raw_conn = supabase_engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cursor:
+            if not _table_ready:
+                cursor.execute(CREATE_TABLE_SQL)
+            cursor.execute(
+                f"DELETE FROM {LEADERBOARD_TABLE} WHERE leaderboard_date = %s",
+                (leaderboard_date,),
+            )
+            cursor.copy_expert(
+                f"COPY {LEADERBOARD_TABLE} ({', '.join(LEADERBOARD_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        raw_conn.commit()
+        _table_ready = True
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+    return row_count
+
+def publish_dates(dates: List[str], prod_engine: Engine, supabase_engine: Engine) -> None:
+    """Compute and publish the leaderboard for each date, one transaction per date."""
+    for leaderboard_date in dates:
+        started = time.perf_counter()
+        roi_df = get_roi_df(leaderboard_date, prod_engine)
+        computed = time.perf_counter()
+        published = publish_leaderboard(leaderboard_date, roi_df, supabase_engine)
+        finished = time.perf_counter()
+        print(
+            f"{leaderboard_date}: published {published} rows "
+            f"(compute {computed - started:.2f}s, publish {(finished - computed) * 1000:.0f}ms)"
+        )
+
+def _date_range(start: str, end: str) -> List[str]:
+    first = datetime.strptime(start, "%Y-%m-%d").date()
+    last = datetime.strptime(end, "%Y-%m-%d").date()
+    days = (last - first).days
+    return [(first + timedelta(days=offset)).isoformat() for offset in range(days + 1)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish BTC Prophets leaderboards to Supabase.")
+    parser.add_argument("start", nargs="?", default=date.today().isoformat(), help="First date (YYYY-MM-DD)")
+    parser.add_argument("end", nargs="?", default=None, help="Last date (YYYY-MM-DD), inclusive")
+    args = parser.parse_args()
+
+    try:
+        publish_dates(
+            _date_range(args.start, args.end or args.start),
+            db_config.get_prod_engine(),
+            db_config.get_supabase_engine(),
+        )
+    finally:
+        db_config.close_connections()
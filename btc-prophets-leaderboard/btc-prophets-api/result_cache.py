@@ -0,0 +1,187 @@
+"""Leaderboard result cache shared by all worker processes."""
+
+import argparse
+import gzip
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leaderboard_cache.sqlite3")
+
+# Boards for recent dates still change as markets resolve; older ones are final
+RECENT_TTL_SECONDS = 60.0
+SETTLED_TTL_SECONDS = 7 * 24 * 3600.0
+SETTLED_AFTER_DAYS = 2
+
+# Moderate levels: near-maximal ratios on JSON at a fraction of the CPU of
+# gzip 9 / brotli 11, which take seconds on large boards
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Each content coding is a distinct representation and needs its own strong ETag
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS leaderboard_responses (
+    leaderboard_date TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    body BLOB NOT NULL,
+    gzip_body BLOB NOT NULL,
+    br_body BLOB,
+    computed_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+class CachedResult(NamedTuple):
+    """A cached leaderboard response, serialized once in every encoding we serve."""
+
+    etag: str
+    body: bytes
+    gzip_body: bytes
+    br_body: Optional[bytes]
+    computed_at: float
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def encoded(self, encoding: str) -> Optional[bytes]:
+        """Body for a content coding ('br', 'gzip' or 'identity'), if available."""
+        if encoding == "br":
+            return self.br_body
+        if encoding == "gzip":
+            return self.gzip_body
+        return self.body
+
+    def etag_for(self, encoding: str) -> str:
+        """Strong ETag of the representation in a content coding."""
+        return self.etag[:-1] + ETAG_SUFFIXES[encoding] + '"'
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag derived from the response content."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def ttl_for_date(leaderboard_date: str) -> float:
+    """Cache lifetime in seconds for a leaderboard date."""
+    day = datetime.strptime(leaderboard_date, '%Y-%m-%d').date()
+    today = datetime.now(timezone.utc).date()
+    if today - day >= timedelta(days=SETTLED_AFTER_DAYS):
+        return SETTLED_TTL_SECONDS
+    return RECENT_TTL_SECONDS
+
+class ResultCache:
+    """
+    Leaderboard responses stored in a local SQLite database.
+
+    Every uvicorn worker opens the same file, so a board computed by one
+    worker is served by all of them and an invalidation applies everywhere.
+    The database runs in WAL mode so readers never block the writer.
+
+    Each board is stored as the serialized JSON body plus gzip and (when
+    the brotli package is installed) brotli encodings and a content-hash
+    ETag, so repeat reads cost no serialization or compression.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("LEADERBOARD_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA_SQL)
+            self._initialized = True
+        return conn
+
+    def get(self, leaderboard_date: str) -> Optional[CachedResult]:
+        """Return the cached board for a date, fresh or stale, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT etag, body, gzip_body, br_body, computed_at, expires_at "
+                "FROM leaderboard_responses WHERE leaderboard_date = ?",
+                (leaderboard_date,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return CachedResult(*row)
+
+    def put(self, leaderboard_date: str, body: bytes, ttl: Optional[float] = None) -> CachedResult:
+        """Compress and store a serialized board, replacing any previous entry for the date."""
+        computed_at = time.time()
+        expires_at = computed_at + (ttl if ttl is not None else ttl_for_date(leaderboard_date))
+        result = CachedResult(
+            etag=content_etag(body),
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+            br_body=brotli.compress(body, quality=BROTLI_QUALITY) if brotli is not None else None,
+            computed_at=computed_at,
+            expires_at=expires_at,
+        )
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO leaderboard_responses "
+                "(leaderboard_date, etag, body, gzip_body, br_body, computed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (leaderboard_date, *result),
+            )
+        finally:
+            conn.close()
+        return result
+
+    def invalidate(self, leaderboard_date: Optional[str] = None) -> int:
+        """Drop the cached board for a date, or every board if no date is given."""
+        conn = self._connect()
+        try:
+            if leaderboard_date is None:
+                cursor = conn.execute("DELETE FROM leaderboard_responses")
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM leaderboard_responses WHERE leaderboard_date = ?", (leaderboard_date,)
+                )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+# Global result cache instance
+result_cache = ResultCache()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the shared leaderboard cache.")
+    parser.add_argument("--invalidate", nargs="?", const="all", metavar="DATE",
+                        help="Drop the cached board for DATE (YYYY-MM-DD), or all boards")
+    args = parser.parse_args()
+
+    if args.invalidate:
+        removed = result_cache.invalidate(None if args.invalidate == "all" else args.invalidate)
+        print(f"Invalidated {removed} cached leaderboard(s) in {result_cache.path}")
+    else:
+        conn = result_cache._connect()
+        try:
+            rows = conn.execute(
+                "SELECT leaderboard_date, etag, length(body), length(gzip_body), length(br_body), "
+                "computed_at, expires_at FROM leaderboard_responses ORDER BY 1"
+            ).fetchall()
+        finally:
+            conn.close()
+        now = time.time()
+        for leaderboard_date, etag, size, gzip_size, br_size, computed_at, expires_at in rows:
+            state = "fresh" if now < expires_at else "stale"
+            print(
+                f"{leaderboard_date}  {etag}  {size}B (gzip {gzip_size}B, br {br_size or '-'}B)  "
+                f"computed {datetime.fromtimestamp(computed_at).isoformat()}  {state}"
+            )
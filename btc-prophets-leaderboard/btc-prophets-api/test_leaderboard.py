@@ -0,0 +1,116 @@
+"""Tests for merging leg partials, checked against the rules of the original single SQL query."""
+
+import pandas as pd
+import pytest
+
+import leaderboard
+from leaderboard import AMM_LEG_DTYPES, CLOB_LEG_DTYPES, get_roi_df, merge_leg_partials
+
+# Market 1 resolved YES, market 2 resolved NO; market 99 is not in the catalog
+RESOLUTIONS = {1: "YES", 2: "NO"}
+
+def leg(rows, dtypes=AMM_LEG_DTYPES):
+    """Build a leg result from (owner, market_id, outcome, trade_profit, net_position, position_usd_value, buy) rows."""
+    return pd.DataFrame(rows, columns=list(dtypes)).astype(dtypes)
+
+def totals_by_wallet(partials):
+    totals = merge_leg_partials(partials, RESOLUTIONS)
+    return totals.set_index("wallet_address", drop=False)
+
+def test_position_split_across_legs_redeems_once():
+    # Bought 10 YES at 0.6 on the AMM and 5 at 0.6 on the CLOB, each redeeming 1 USD
+    totals = totals_by_wallet([
+        leg([("0xa", 1, "YES", -6.0, 10.0, 10.0, 6.0)]),
+        leg([("0xa", 1, "YES", -3.0, 5.0, 5.0, 3.0)]),
+    ])
+
+    # net_position * weighted_positions_usd_rate == SUM(positions * token_usd_rate)
+    assert totals.loc["0xa", "total_profit_usd"] == pytest.approx(-9.0 + 15.0)
+    assert totals.loc["0xa", "total_buy_volume_usd"] == pytest.approx(9.0)
+
+def test_net_position_zero_across_legs_gets_no_resolution_profit():
+    # Bought 4 YES at 0.5 on a leg redeeming 0.5 USD per contract and sold
+    # them at 0.7 on a leg redeeming 1 USD, so the position values do not cancel
+    totals = totals_by_wallet([
+        leg([("0xb", 1, "YES", -2.0, 4.0, 2.0, 2.0)]),
+        leg([("0xb", 1, "YES", 2.8, -4.0, -4.0, 0.0)]),
+    ])
+
+    # SQL: SUM(positions) = 0 gives a zero weighted rate, so only the trade profit counts
+    assert totals.loc["0xb", "total_profit_usd"] == pytest.approx(0.8)
+    assert totals.loc["0xb", "total_buy_volume_usd"] == pytest.approx(2.0)
+
+def test_losing_outcome_gets_no_resolution_profit():
+    totals = totals_by_wallet([leg([("0xc", 2, "YES", -4.0, 8.0, 8.0, 4.0)])])
+
+    assert totals.loc["0xc", "total_profit_usd"] == pytest.approx(-4.0)
+
+def test_sell_only_wallet():
+    # Sold 5 YES at 0.4 in a market that resolved YES
+    totals = totals_by_wallet([leg([("0xd", 1, "YES", 2.0, -5.0, -5.0, 0.0)])])
+
+    # The short position on the winning outcome is settled at the redemption rate
+    assert totals.loc["0xd", "total_profit_usd"] == pytest.approx(2.0 - 5.0)
+    assert totals.loc["0xd", "total_buy_volume_usd"] == 0.0
+
+def test_null_outcome_and_unknown_market_rows_are_left_out_of_profit():
+    totals = totals_by_wallet([
+        leg([
+            ("0xe", 1, "YES", -1.0, 2.0, 2.0, 1.0),
+            ("0xe", 1, None, -5.0, 3.0, 3.0, 5.0),
+        ]),
+        leg([("0xe", 99, "YES", -7.0, 9.0, 9.0, 7.0)]),
+    ])
+
+    # SQL: a NULL resolution or outcome makes the row's total profit NULL,
+    # which SUM ignores; its buys still count towards the volume
+    assert totals.loc["0xe", "total_profit_usd"] == pytest.approx(-1.0 + 2.0)
+    assert totals.loc["0xe", "total_buy_volume_usd"] == pytest.approx(13.0)
+
+class FakeCatalog:
+    def ensure_fresh(self, engine):
+        pass
+
+    def leaderboard_market_ids(self, date):
+        return [1, 2]
+
+    def addresses(self, market_ids):
+        return []
+
+    def resolutions(self, market_ids):
+        return RESOLUTIONS
+
+class FakeProfiles:
+    accounts_by_id = {7: "0xclob"}
+
+    def ensure_fresh(self, engine):
+        pass
+
+    def accounts(self, engine, profile_ids):
+        return {profile_id: self.accounts_by_id.get(profile_id) for profile_id in profile_ids}
+
+    def display_names(self, engine, accounts):
+        return {account: account.upper() for account in accounts}
+
+def test_roi_df(monkeypatch):
+    legs = {
+        leaderboard.AMM_LEG_QUERY: leg([
+            ("0xa", 1, "YES", -6.0, 10.0, 10.0, 6.0),
+            ("0xd", 1, "YES", 2.0, -5.0, -5.0, 0.0),
+            (None, 1, "YES", -1.0, 1.0, 1.0, 1.0),
+        ]),
+        leaderboard.CLOB_TAKER_LEG_QUERY: leg([
+            (7, 2, "NO", -2.0, 4.0, 4.0, 2.0),
+            (8, 2, "NO", -1.0, 1.0, 1.0, 1.0),
+        ], CLOB_LEG_DTYPES),
+        leaderboard.CLOB_MAKER_LEG_QUERY: leg([(7, 1, "YES", -2.0, 4.0, 4.0, 2.0)], CLOB_LEG_DTYPES),
+    }
+    monkeypatch.setattr(leaderboard, "read_sql_copy", lambda query, *args: legs[query])
+
+    roi_df = get_roi_df("2025-08-16", None, FakeCatalog(), FakeProfiles())
+
+    # Unknown wallets and the sell-only wallet are dropped; ROI = profit / buys
+    assert list(roi_df["wallet_address"]) == ["0xclob", "0xa"]
+    assert list(roi_df["display_name"]) == ["0XCLOB", "0XA"]
+    assert roi_df["total_profit_usd"].tolist() == pytest.approx([4.0, 4.0])
+    assert roi_df["roi"].tolist() == pytest.approx([1.0, 4.0 / 6.0])